@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for `df.stb.counts()`
+
+Run against the previous release to see the difference, for example:
+    asv continuous master HEAD -b Counts
+"""
+
+import numpy as np
+import pandas as pd
+import sidetable  # noqa: F401
+
+
+class Counts:
+    params = [[10_000, 1_000_000], [10, 100]]
+    param_names = ['rows', 'cols']
+
+    def setup(self, rows, cols):
+        rng = np.random.default_rng(42)
+        data = {f'num_{i}': rng.integers(0, 1_000, rows) for i in range(cols // 2)}
+        data.update({
+            f'str_{i}': pd.Series(rng.integers(0, 5_000, rows)).astype(str)
+            for i in range(cols - cols // 2)
+        })
+        self.df = pd.DataFrame(data)
+
+    def time_counts(self, rows, cols):
+        self.df.stb.counts()
+
+    def time_counts_threads(self, rows, cols):
+        self.df.stb.counts(n_jobs=-1)
+
+
+class ApproxUnique:
+    """Time, memory and error of the HyperLogLog unique estimate compared to the exact count"""
+    params = [[10, 14, 18], [1_000, 1_000_000]]
+    param_names = ['precision', 'cardinality']
+
+    def setup(self, precision, cardinality):
+        rng = np.random.default_rng(42)
+        self.df = pd.DataFrame({
+            'key': pd.Series(rng.integers(0, cardinality, 2_000_000)).astype(str)
+        })
+        self.exact = self.df['key'].nunique()
+
+    def time_counts_approx(self, precision, cardinality):
+        self.df.stb.counts(approx_unique=True, approx_precision=precision)
+
+    def peakmem_counts_approx(self, precision, cardinality):
+        self.df.stb.counts(approx_unique=True, approx_precision=precision)
+
+    def track_relative_error(self, precision, cardinality):
+        table = self.df.stb.counts(approx_unique=True, approx_precision=precision)
+        return abs(table.loc['key', 'unique'] - self.exact) / self.exact
+
+    track_relative_error.unit = 'ratio'
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for `df.stb.freq()`"""
+
+import numpy as np
+import pandas as pd
+import sidetable
+
+
+class FreqThresh:
+    params = [[10_000, 1_000_000], [50, 100]]
+    param_names = ['groups', 'thresh']
+
+    def setup(self, groups, thresh):
+        rng = np.random.default_rng(42)
+        rows = groups * 2
+        self.df = pd.DataFrame({
+            'key': rng.zipf(1.2, rows) % groups,
+            'label': rng.integers(0, 5, rows).astype(str),
+            'value': rng.random(rows)
+        })
+
+    def time_freq(self, groups, thresh):
+        self.df.stb.freq(['key', 'label'], thresh=thresh)
+
+    def time_freq_value(self, groups, thresh):
+        self.df.stb.freq(['key'], value='value', thresh=thresh)
+
+
+class FreqCodes:
+    params = [['category', 'int'], [1, 2]]
+    param_names = ['dtype', 'cols']
+
+    def setup(self, dtype, cols):
+        rng = np.random.default_rng(42)
+        rows = 5_000_000
+        data = {f'col_{i}': rng.integers(0, 500, rows) for i in range(cols)}
+        self.df = pd.DataFrame(data).astype(dtype if dtype == 'category' else 'int64')
+        self.cols = list(data)
+
+    def time_freq(self, dtype, cols):
+        self.df.stb.freq(self.cols)
+
+    def time_freq_thresh(self, dtype, cols):
+        self.df.stb.freq(self.cols, thresh=80)
+
+
+class FreqIncremental:
+    params = [1_000, 100_000]
+    param_names = ['new_rows']
+
+    def setup(self, new_rows):
+        rng = np.random.default_rng(42)
+        rows = 5_000_000
+        self.df = pd.DataFrame({
+            'status': rng.choice(['ok', 'warn', 'error', 'timeout'], rows),
+            'host': rng.integers(0, 500, rows)
+        })
+        self.new_rows = self.df.iloc[:new_rows]
+        self.incremental = self.df.stb.freq(['status', 'host'], incremental=True)
+
+    def time_append(self, new_rows):
+        self.incremental.append(self.new_rows)
+
+    def time_full(self, new_rows):
+        self.df.stb.freq(['status', 'host'])
+
+
+class FreqWindow:
+    params = ['1h', '1D']
+    param_names = ['window']
+
+    def setup(self, window):
+        rng = np.random.default_rng(42)
+        rows = 5_000_000
+        seconds = np.sort(rng.integers(0, 90 * 86_400, rows))
+        self.df = pd.DataFrame({
+            'timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(seconds, unit='s'),
+            'status': rng.choice(['ok', 'warn', 'error', 'timeout'], rows),
+            'value': rng.random(rows)
+        })
+
+    def time_freq(self, window):
+        self.df.stb.freq(['status'], thresh=90, window=window, on='timestamp')
+
+    def time_freq_value(self, window):
+        self.df.stb.freq(['status'], value='value', window=window, on='timestamp')
+
+    def time_missing(self, window):
+        self.df.stb.missing(window=window, on='timestamp')
+
+
+class FreqMetrics:
+    def setup(self):
+        rng = np.random.default_rng(42)
+        rows = 5_000_000
+        self.df = pd.DataFrame({
+            'region': rng.choice(list('abcdefgh'), rows),
+            'product': rng.integers(0, 2_000, rows),
+            'sales': rng.random(rows),
+            'units': rng.integers(1, 5, rows),
+            'margin': rng.random(rows)
+        })
+
+    def time_freq_value_list(self):
+        self.df.stb.freq(['region', 'product'], value=['sales', 'units', 'margin'])
+
+    def time_freq_weights(self):
+        self.df.stb.freq(['region', 'product'], weights='units')
+
+
+class FreqDropna:
+    params = [['category', 'object'], [True, False]]
+    param_names = ['dtype', 'dropna']
+
+    def setup(self, dtype, dropna):
+        rng = np.random.default_rng(42)
+        rows = 5_000_000
+        key = pd.Series(rng.integers(0, 500, rows)).astype(str)
+        key[rng.random(rows) < 0.2] = None
+        self.df = pd.DataFrame({'key': key.astype(dtype), 'value': rng.random(rows)})
+
+    def time_freq(self, dtype, dropna):
+        self.df.stb.freq(['key'], thresh=90, dropna=dropna)
+
+    def time_freq_value(self, dtype, dropna):
+        self.df.stb.freq(['key'], value='value', dropna=dropna)
+
+
+class FreqProfiler:
+    """Cost of the profiling hooks when they are off and when they are timing each phase"""
+    params = [None, 'time', 'memory']
+    param_names = ['profiler']
+
+    def setup(self, profiler):
+        rng = np.random.default_rng(42)
+        self.df = pd.DataFrame({'key': rng.integers(0, 100, 10_000)})
+        if profiler:
+            sidetable.set_profiler(lambda timing: None, memory=profiler == 'memory')
+
+    def teardown(self, profiler):
+        sidetable.set_profiler(None)
+
+    def time_freq(self, profiler):
+        self.df.stb.freq(['key'], thresh=80)
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for `df.stb.missing()`"""
+
+import numpy as np
+import pandas as pd
+import sidetable  # noqa: F401
+
+
+class Missing:
+    params = [1_000_000, 10_000_000]
+    param_names = ['rows']
+
+    def setup(self, rows):
+        rng = np.random.default_rng(42)
+        data = rng.random((rows, 10))
+        data[data < 0.1] = np.nan
+        self.df = pd.DataFrame(data)
+        self.df['label'] = pd.Series(rng.integers(0, 100, rows)).astype(str)
+        self.df.loc[self.df.index % 7 == 0, 'label'] = None
+
+    def time_missing(self, rows):
+        self.df.stb.missing()
+
+    def peakmem_missing(self, rows):
+        self.df.stb.missing()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Time and peak memory of every df.stb method from 10k to 10M rows
+
+The rows parameter is the x axis of the scaling curves drawn by asv publish. Compare two
+releases with:
+    asv continuous v0.9.1 HEAD -b Scaling
+"""
+
+import sidetable  # noqa: F401
+
+from .generators import (ROWS, multiindex_columns_frame, multiindex_frame, narrow_frame,
+                         numeric_frame, wide_frame)
+
+# Wide frames are skipped above this many rows to keep the memory of a run reasonable
+WIDE_MAX_ROWS = 1_000_000
+
+
+class FreqScaling:
+    params = [ROWS, ['category', 'string', 'int'], ['low', 'high']]
+    param_names = ['rows', 'dtype', 'cardinality']
+
+    def setup(self, rows, dtype, cardinality):
+        self.df = narrow_frame(rows, dtype, cardinality, nulls=0.05)
+
+    def time_freq(self, rows, dtype, cardinality):
+        self.df.stb.freq(['key'])
+
+    def time_freq_two_cols(self, rows, dtype, cardinality):
+        self.df.stb.freq(['key', 'label'], thresh=80)
+
+    def time_freq_value(self, rows, dtype, cardinality):
+        self.df.stb.freq(['key'], value='value')
+
+    def time_freq_dropna(self, rows, dtype, cardinality):
+        self.df.stb.freq(['key'], dropna=False)
+
+    def peakmem_freq(self, rows, dtype, cardinality):
+        self.df.stb.freq(['key', 'label'], thresh=80)
+
+
+class MissingScaling:
+    params = [ROWS, ['narrow', 'wide']]
+    param_names = ['rows', 'shape']
+
+    def setup(self, rows, shape):
+        if shape == 'wide':
+            if rows > WIDE_MAX_ROWS:
+                raise NotImplementedError
+            self.df = wide_frame(rows)
+        else:
+            self.df = narrow_frame(rows, nulls=0.1)
+
+    def time_missing(self, rows, shape):
+        self.df.stb.missing()
+
+    def peakmem_missing(self, rows, shape):
+        self.df.stb.missing()
+
+
+class CountsScaling:
+    params = [ROWS, ['narrow', 'wide']]
+    param_names = ['rows', 'shape']
+
+    def setup(self, rows, shape):
+        if shape == 'wide':
+            if rows > WIDE_MAX_ROWS:
+                raise NotImplementedError
+            self.df = wide_frame(rows, cols=40)
+        else:
+            self.df = narrow_frame(rows, cardinality='high', nulls=0.1)
+
+    def time_counts(self, rows, shape):
+        self.df.stb.counts()
+
+    def peakmem_counts(self, rows, shape):
+        self.df.stb.counts()
+
+
+class SubtotalScaling:
+    params = [ROWS, [2, 4]]
+    param_names = ['rows', 'depth']
+
+    def setup(self, rows, depth):
+        self.df = multiindex_frame(rows, depth)
+
+    def time_subtotal(self, rows, depth):
+        self.df.stb.subtotal()
+
+    def time_subtotal_level(self, rows, depth):
+        self.df.stb.subtotal(sub_level=1)
+
+    def peakmem_subtotal(self, rows, depth):
+        self.df.stb.subtotal()
+
+
+class FlattenScaling:
+    params = [ROWS, [2, 4]]
+    param_names = ['rows', 'levels']
+
+    def setup(self, rows, levels):
+        self.df = multiindex_columns_frame(rows, levels=levels)
+
+    def time_flatten(self, rows, levels):
+        self.df.stb.flatten()
+
+    def time_flatten_no_copy(self, rows, levels):
+        self.df.stb.flatten(copy=False)
+
+    def peakmem_flatten_no_copy(self, rows, levels):
+        self.df.stb.flatten(copy=False)
+
+    def time_flatten_levels(self, rows, levels):
+        self.df.stb.flatten(levels=[0, levels - 1], reset=False)
+
+    def peakmem_flatten(self, rows, levels):
+        self.df.stb.flatten()
+
+
+class FlattenWide:
+    params = [1_000, 100_000]
+    param_names = ['cols']
+
+    def setup(self, cols):
+        self.df = multiindex_columns_frame(10, cols=cols)
+
+    def time_flatten(self, cols):
+        self.df.stb.flatten(copy=False)
+
+
+class PrettyScaling:
+    params = [ROWS]
+    param_names = ['rows']
+
+    def setup(self, rows):
+        self.df = numeric_frame(rows)
+
+    def time_pretty(self, rows):
+        self.df.stb.pretty().to_html()
+
+    def peakmem_pretty(self, rows):
+        self.df.stb.pretty().to_html()
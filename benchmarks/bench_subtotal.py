@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for `df.stb.subtotal()`"""
+
+import numpy as np
+import pandas as pd
+import sidetable  # noqa: F401
+
+
+class Subtotal:
+    params = [10_000, 100_000]
+    param_names = ['groups']
+
+    def setup(self, groups):
+        rng = np.random.default_rng(42)
+        rows = groups * 2
+        df = pd.DataFrame({
+            'a': rng.integers(0, 50, rows).astype(str),
+            'b': rng.integers(0, 100, rows).astype(str),
+            'c': rng.integers(0, groups // 50, rows).astype(str),
+            'value': rng.normal(size=rows)
+        })
+        self.df = df.groupby(['a', 'b', 'c']).sum()
+
+    def time_subtotal(self, groups):
+        self.df.stb.subtotal()
+
+    def time_subtotal_single_level(self, groups):
+        self.df.stb.subtotal(sub_level=1)
+
+
+class GroupLevels:
+    def setup(self):
+        rng = np.random.default_rng(42)
+        rows = 1_000_000
+        index = pd.MultiIndex.from_arrays([
+            rng.integers(0, 50, rows).astype(str),
+            rng.integers(0, 100, rows).astype(str),
+            np.arange(rows)
+        ])
+        self.df = pd.DataFrame({'value': np.ones(rows)}, index=index)
+
+    def time_group_levels(self):
+        self.df.stb._get_group_levels(2)
+
+    def time_subtotal(self):
+        self.df.stb.subtotal()
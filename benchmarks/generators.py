@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Synthetic data for the benchmarks
+
+Every generator is seeded so the same data is built for each benchmark run and release.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Row counts used for the scaling curves
+ROWS = [10_000, 100_000, 1_000_000, 10_000_000]
+
+# Distinct values in a column for each cardinality
+CARDINALITY = {'low': 20, 'high': None}
+
+
+def _distinct(rows, cardinality):
+    """ Number of distinct values for a cardinality name. High cardinality columns have a
+    distinct value for about every other row
+    """
+    distinct = CARDINALITY[cardinality]
+    return distinct if distinct is not None else max(rows // 2, 1)
+
+
+def make_column(rng, rows, dtype='string', cardinality='low', nulls=0.0):
+    """ Build one column of data
+
+    Args:
+        rng (Generator):     numpy random generator
+        rows (int):          Number of rows
+        dtype (str):         'category', 'string', 'int' or 'float'
+        cardinality (str):   'low' for a few repeated values or 'high' for mostly unique values
+        nulls (float):       Fraction of the rows that are missing. Integer columns are
+                             stored as float when they have missing values
+
+    Returns:
+        Series with the data
+    """
+    codes = rng.integers(0, _distinct(rows, cardinality), rows)
+    if dtype == 'float':
+        values = pd.Series(codes + rng.random(rows))
+    elif dtype == 'int':
+        values = pd.Series(codes)
+    elif dtype in ('string', 'category'):
+        values = pd.Series(codes).map('value_{}'.format)
+    else:
+        raise ValueError(f'Unknown dtype {dtype}')
+    if nulls:
+        values = values.mask(rng.random(rows) < nulls)
+    if dtype == 'category':
+        values = values.astype('category')
+    return values
+
+
+def narrow_frame(rows, dtype='string', cardinality='low', nulls=0.0, seed=42):
+    """ DataFrame with two grouping columns of one dtype, a float value and a datetime
+
+    Args:
+        rows (int):        Number of rows
+        dtype (str):       dtype of the key and label columns. See make_column
+        cardinality (str): Cardinality of the key column. label always has low cardinality
+        nulls (float):     Fraction of missing values in key, label and value
+        seed (int):        Random seed
+
+    Returns:
+        DataFrame with key, label, value and timestamp columns
+    """
+    rng = np.random.default_rng(seed)
+    seconds = np.sort(rng.integers(0, 90 * 86_400, rows))
+    return pd.DataFrame({
+        'key': make_column(rng, rows, dtype, cardinality, nulls),
+        'label': make_column(rng, rows, dtype, 'low', nulls),
+        'value': make_column(rng, rows, 'float', 'high', nulls),
+        'timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(seconds, unit='s')
+    })
+
+
+def wide_frame(rows, cols=100, nulls=0.1, seed=42):
+    """ DataFrame that cycles through every dtype and cardinality across its columns
+
+    Args:
+        rows (int):    Number of rows
+        cols (int):    Number of columns
+        nulls (float): Fraction of missing values in every column
+        seed (int):    Random seed
+
+    Returns:
+        DataFrame with cols columns
+    """
+    rng = np.random.default_rng(seed)
+    kinds = [(dtype, cardinality)
+             for dtype in ('category', 'string', 'int', 'float')
+             for cardinality in ('low', 'high')]
+    data = {}
+    for i in range(cols):
+        dtype, cardinality = kinds[i % len(kinds)]
+        data[f'{dtype}_{cardinality}_{i}'] = make_column(rng, rows, dtype, cardinality, nulls)
+    return pd.DataFrame(data)
+
+
+def multiindex_frame(rows, depth=3, seed=42):
+    """ DataFrame with a deep MultiIndex like the result of a groupby, as used by subtotal()
+
+    Args:
+        rows (int):  Number of rows before grouping
+        depth (int): Number of index levels
+        seed (int):  Random seed
+
+    Returns:
+        DataFrame indexed by depth levels with sales and units columns
+    """
+    rng = np.random.default_rng(seed)
+    # Each level splits the groups of the level above into more pieces
+    levels = {
+        f'level_{i}': make_column(rng, rows, 'string', 'low' if i < depth - 1 else 'high')
+        for i in range(depth)
+    }
+    frame = pd.DataFrame(levels)
+    frame['sales'] = rng.random(rows)
+    frame['units'] = rng.integers(1, 10, rows)
+    return frame.groupby(list(levels)).sum()
+
+
+def multiindex_columns_frame(rows, cols=20, levels=3, seed=42):
+    """ DataFrame with MultiIndex columns like the result of a pivot or agg, as used by
+    flatten()
+
+    Args:
+        rows (int):   Number of rows
+        cols (int):   Number of columns
+        levels (int): Number of column levels
+        seed (int):   Random seed
+
+    Returns:
+        DataFrame with a MultiIndex on the columns
+    """
+    rng = np.random.default_rng(seed)
+    columns = pd.MultiIndex.from_arrays([
+        [f'level{level}_{i % (level + 2)}' for i in range(cols)] for level in range(levels - 1)
+    ] + [[f'col_{i}' for i in range(cols)]])
+    return pd.DataFrame(rng.random((rows, cols)), columns=columns)
+
+
+def numeric_frame(rows, cols=10, nulls=0.1, seed=42):
+    """ DataFrame of numbers with very different magnitudes, as formatted by pretty()
+
+    Args:
+        rows (int):    Number of rows
+        cols (int):    Number of columns
+        nulls (float): Fraction of missing values
+        seed (int):    Random seed
+
+    Returns:
+        DataFrame with a label column and cols numeric columns
+    """
+    rng = np.random.default_rng(seed)
+    data = {'label': make_column(rng, rows, 'string', 'high')}
+    for i in range(cols):
+        values = rng.random(rows) * 10 ** (i % 8)
+        values[rng.random(rows) < nulls] = np.nan
+        data[f'num_{i}'] = values
+    return pd.DataFrame(data)
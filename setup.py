@@ -23,10 +23,12 @@ Links:
 from setuptools import setup, find_packages
 from codecs import open
 
-requirements = ['pandas>=1.0']
+requirements = ['pandas>=1.1']
 
 test_requirements = ['pytest', 'seaborn']
 
+extras_requirements = {'polars': ['polars', 'pyarrow']}
+
 here = path.abspath(path.dirname(__file__))
 with open(path.join(here, 'README.md'), encoding='utf-8') as f:
     long_description = f.read()
@@ -43,6 +45,7 @@ setup(
     ],
     description="sidetable builds simple but useful summary tables of your data",
     install_requires=requirements,
+    extras_require=extras_requirements,
     license="MIT license",
     long_description=long_description,
     long_description_content_type="text/markdown",
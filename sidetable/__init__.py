@@ -6,5 +6,12 @@ __email__ = 'chris@moffitts.net'
 __version__ = '0.9.1'
 
 from .sidetable import SideTableAccessor
+from .stream import freq_stream, FreqState, IncrementalFreq, MissingState, CountsState
+from .sketch import SpaceSaving, HyperLogLog
+from .cache import enable_cache, disable_cache, cache_clear, cache_info
+from .parquet import scan_parquet
+from .profiling import set_profiler, profile, PhaseTiming
 
-__all__ = ['__version__']
\ No newline at end of file
+__all__ = ['__version__', 'freq_stream', 'FreqState', 'IncrementalFreq', 'MissingState',
+           'CountsState', 'SpaceSaving', 'HyperLogLog', 'enable_cache', 'disable_cache',
+           'cache_clear', 'cache_info', 'scan_parquet', 'set_profiler', 'profile', 'PhaseTiming']
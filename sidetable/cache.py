@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Opt-in cache for the results of the sidetable summaries"""
+
+from collections import OrderedDict, namedtuple
+import functools
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# Number of evenly spaced rows hashed to detect changes to a DataFrame
+_SAMPLE_ROWS = 1_000
+
+CacheInfo = namedtuple('CacheInfo',
+                       ['hits', 'misses', 'maxsize', 'currsize', 'nbytes', 'max_bytes'])
+
+
+def _freeze(value):
+    """ Internal helper that converts lists and dicts in the arguments to hashable tuples """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    hash(value)
+    return value
+
+
+def _fingerprint(obj):
+    """ Internal helper that builds a cheap fingerprint of a DataFrame from its shape, columns,
+    dtypes and a hash of a sample of its rows.
+
+    Args:
+        obj (DataFrame): Data to fingerprint
+
+    Returns:
+        Hashable fingerprint or None if the data can not be hashed
+    """
+    positions = np.unique(np.linspace(0, len(obj) - 1, min(len(obj), _SAMPLE_ROWS)).astype(int))
+    try:
+        sample_hash = int(pd.util.hash_pandas_object(obj.iloc[positions], index=True).sum())
+        return (obj.shape, _freeze(list(obj.columns)),
+                _freeze([str(dtype) for dtype in obj.dtypes]), sample_hash)
+    except TypeError:
+        return None
+
+
+def _result_bytes(result):
+    return int(result.memory_usage(index=True, deep=True).sum())
+
+
+class ResultCache:
+    """Least recently used cache of summary tables with a limit on the number of entries
+    and their total memory.
+    """
+    def __init__(self, maxsize=128, max_bytes=256 * 2**20):
+        if maxsize < 1 or max_bytes < 1:
+            raise AttributeError('maxsize and max_bytes must be positive')
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._frames = set()
+        # Reentrant because garbage collection can clear a frame while the lock is held
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return None
+
+    def put(self, obj, key, result):
+        nbytes = _result_bytes(result)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if id(obj) not in self._frames:
+                # Drop the results for a DataFrame as soon as it is garbage collected
+                self._frames.add(id(obj))
+                weakref.finalize(obj, self.clear_frame, id(obj))
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (result, nbytes)
+            self.nbytes += nbytes
+            while len(self._entries) > self.maxsize or self.nbytes > self.max_bytes:
+                self.nbytes -= self._entries.popitem(last=False)[1][1]
+
+    def clear_frame(self, frame_id):
+        """ Remove every result for one DataFrame """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == frame_id]:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._frames.discard(frame_id)
+
+    def clear(self):
+        """ Remove every result and reset the statistics """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.nbytes = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries),
+                             self.nbytes, self.max_bytes)
+
+
+_cache = None
+
+
+def enable_cache(maxsize=128, max_bytes=256 * 2**20):
+    """ Cache the results of df.stb.freq(), df.stb.counts() and df.stb.missing() so repeated
+    calls with the same arguments on an unchanged DataFrame return immediately.
+
+    Changes are detected from the shape, columns, dtypes and a sample of the rows. Call
+    cache_clear() after editing values of a DataFrame in place. Styled tables are not cached.
+
+    Args:
+        maxsize (int):   Maximum number of results to keep. Defaults to 128
+        max_bytes (int): Maximum memory used by the results. Defaults to 256 MB
+    """
+    global _cache
+    _cache = ResultCache(maxsize=maxsize, max_bytes=max_bytes)
+
+
+def disable_cache():
+    """ Stop caching results and release the cached tables """
+    global _cache
+    _cache = None
+
+
+def cache_clear():
+    """ Remove every cached result and reset the hit and miss counts """
+    if _cache is not None:
+        _cache.clear()
+
+
+def forget(obj):
+    """ Remove the cached results for one DataFrame """
+    if _cache is not None:
+        _cache.clear_frame(id(obj))
+
+
+def cache_info():
+    """ Return the hits, misses, maxsize, currsize, nbytes and max_bytes of the cache or
+    None if caching is not enabled
+    """
+    if _cache is None:
+        return None
+    return _cache.info()
+
+
+def cached(method):
+    """ Decorator for SideTableAccessor methods that returns a copy of the cached result when
+    the cache is enabled
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = _cache
+        if cache is None or kwargs.get('style'):
+            return method(self, *args, **kwargs)
+        try:
+            params = (_freeze(args), _freeze(kwargs))
+        except TypeError:
+            return method(self, *args, **kwargs)
+        fingerprint = _fingerprint(self._obj)
+        if fingerprint is None:
+            return method(self, *args, **kwargs)
+
+        key = (id(self._obj), fingerprint, method.__name__, params)
+        result = cache.get(key)
+        if result is None:
+            result = method(self, *args, **kwargs)
+            if not isinstance(result, pd.DataFrame):
+                return result
+            cache.put(self._obj, key, result)
+        # Callers are free to modify the table they get back
+        return result.copy()
+    return wrapper
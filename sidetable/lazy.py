@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""Deferred sidetable summaries that are computed together in one pass"""
+
+import numpy as np
+import pandas as pd
+
+from .sidetable import (_check_counts_args, _check_freq_args, _counts_summary, _counts_table,
+                        _factorize_column, _freq_group_data, _freq_table, _missing_table,
+                        _null_count, _value_tally)
+
+
+class SideTablePlan:
+    """Records several sidetable summaries of one DataFrame and computes them together.
+    Each column is factorized at most once and the factorizations, missing value counts and
+    group totals are shared by every summary in the plan.
+
+    Example:
+        freq_class, freq_both, missing = (df.stb.lazy()
+                                          .freq(['class'])
+                                          .freq(['class', 'sex'], thresh=80)
+                                          .missing()
+                                          .collect())
+    """
+    def __init__(self, obj):
+        self._obj = obj
+        self._steps = []
+
+    def freq(self,
+             cols,
+             thresh=100,
+             other_label='others',
+             clip_0=True,
+             value=None,
+             style=False,
+             sort_cols=False,
+             cum_cols=True):
+        """ Add df.stb.freq() to the plan. See df.stb.freq() for the arguments """
+        _check_freq_args(self._obj, cols, value, thresh)
+        self._steps.append(('freq', dict(cols=cols,
+                                         thresh=thresh,
+                                         other_label=other_label,
+                                         clip_0=clip_0,
+                                         value=value,
+                                         style=style,
+                                         sort_cols=sort_cols,
+                                         cum_cols=cum_cols)))
+        return self
+
+    def missing(self, clip_0=False, style=False):
+        """ Add df.stb.missing() to the plan. See df.stb.missing() for the arguments """
+        self._steps.append(('missing', dict(clip_0=clip_0, style=style)))
+        return self
+
+    def counts(self, include=None, exclude=None, sort_ascending=True, sort_col='unique'):
+        """ Add df.stb.counts() to the plan. See df.stb.counts() for the arguments """
+        _check_counts_args(include, exclude, sort_col)
+        self._steps.append(('counts', dict(include=include,
+                                           exclude=exclude,
+                                           sort_ascending=sort_ascending,
+                                           sort_col=sort_col)))
+        return self
+
+    def _counts_positions(self, include, exclude):
+        """ Positions of the columns used by counts() so duplicate column names are kept apart """
+        if include == 'all' or ((include is None) and (exclude is None)):
+            return np.arange(self._obj.shape[1])
+        return (self._obj.iloc[:0].set_axis(range(self._obj.shape[1]), axis='columns')
+                .select_dtypes(include=include, exclude=exclude).columns)
+
+    def collect(self):
+        """ Compute every summary in the plan
+
+        Returns:
+            List with the result of each summary in the order they were added
+        """
+        obj = self._obj
+        factorized = {}
+        null_counts = {}
+        group_data = {}
+
+        # Columns are kept by position so duplicate column names are handled
+        def factorize(i):
+            if i not in factorized:
+                factorized[i] = _factorize_column(obj.iloc[:, i])
+            return factorized[i]
+
+        def nulls(i):
+            if i not in null_counts:
+                if i in factorized:
+                    null_counts[i] = int((factorized[i][0] < 0).sum())
+                else:
+                    null_counts[i] = _null_count(obj.iloc[:, i])
+            return null_counts[i]
+
+        def coded(i):
+            codes, labels = factorize(i)
+            dtype = obj.dtypes.iloc[i]
+            if isinstance(dtype, pd.CategoricalDtype):
+                return (codes, len(labels),
+                        lambda group: pd.Categorical.from_codes(group, dtype=dtype))
+            return codes, len(labels), labels.take
+
+        def freq_positions(cols):
+            # Only columns with a unique name in cols and in the data can be coded by position
+            if len(set(cols)) != len(cols):
+                return None
+            positions = [obj.columns.get_loc(col) for col in cols]
+            if not all(isinstance(i, int) for i in positions):
+                return None
+            return positions
+
+        # Factorize every column that is grouped or tallied before anything else uses them
+        for name, kwargs in self._steps:
+            if name == 'freq':
+                for i in freq_positions(kwargs['cols']) or []:
+                    factorize(i)
+            elif name == 'counts':
+                for i in self._counts_positions(kwargs['include'], kwargs['exclude']):
+                    factorize(i)
+
+        results = []
+        for name, kwargs in self._steps:
+            if name == 'freq':
+                cols = kwargs['cols']
+                value = kwargs['value']
+                key = (tuple(cols), value)
+                if key not in group_data:
+                    col_codes = None
+                    positions = freq_positions(cols)
+                    if positions is not None:
+                        col_codes = [coded(i) for i in positions]
+                    group_data[key] = _freq_group_data(obj, cols, value, col_codes)
+                results.append(_freq_table(group_data[key],
+                                           cols,
+                                           value if value else 'count',
+                                           thresh=kwargs['thresh'],
+                                           other_label=kwargs['other_label'],
+                                           clip_0=kwargs['clip_0'],
+                                           style=kwargs['style'],
+                                           sort_cols=kwargs['sort_cols'],
+                                           cum_cols=kwargs['cum_cols']))
+            elif name == 'missing':
+                missing = pd.Series([nulls(i) for i in range(obj.shape[1])],
+                                    index=obj.columns,
+                                    dtype='int64')
+                results.append(_missing_table(missing, len(obj), **kwargs))
+            else:
+                include = kwargs['include']
+                exclude = kwargs['exclude']
+                positions = self._counts_positions(include, exclude)
+                if include == 'all' or ((include is None) and (exclude is None)):
+                    # Filter out completely null columns
+                    has_values = [nulls(i) < len(obj) for i in positions]
+                    positions = positions[np.array(has_values, dtype=bool)]
+                tallies = [_value_tally(obj.iloc[:, i], factorize(i)) for i in positions]
+                results.append(_counts_table([_counts_summary(tally) for tally in tallies],
+                                             obj.columns[positions],
+                                             kwargs['sort_ascending'],
+                                             kwargs['sort_col']))
+        return results
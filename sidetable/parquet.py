@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Build sidetable summaries from parquet files one row group at a time"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from .sidetable import _check_thresh
+from .stream import FreqState, MissingState, CountsState
+
+
+def _pyarrow_parquet():
+    """ Internal helper that imports pyarrow.parquet only when a scan is used """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError('scan_parquet requires pyarrow. Install it with pip install pyarrow')
+    return pq
+
+
+def _find_files(path):
+    """ Internal helper that lists the parquet files in a file, directory or list of paths """
+    if isinstance(path, (list, tuple)):
+        return [file for item in path for file in _find_files(item)]
+    path = Path(path)
+    if path.is_dir():
+        files = sorted(path.rglob('*.parquet'))
+        if not files:
+            raise FileNotFoundError(f'No parquet files found in {path}')
+        return files
+    if not path.exists():
+        raise FileNotFoundError(f'{path} does not exist')
+    return [path]
+
+
+class ParquetScan:
+    """Summaries of one or more parquet files that only read the columns they need, one row
+    group at a time, and combine the partial results. See sidetable.scan_parquet()
+    """
+    def __init__(self, files):
+        self.files = files
+
+    def _files(self):
+        pq = _pyarrow_parquet()
+        for path in self.files:
+            yield pq.ParquetFile(path)
+
+    @staticmethod
+    def _data_columns(parquet_file):
+        """ Column names without the index columns written by pandas """
+        schema = parquet_file.schema_arrow
+        index_columns = (schema.pandas_metadata or {}).get('index_columns', [])
+        return [name for name in schema.names if name not in index_columns]
+
+    def _row_groups(self, columns=None):
+        for parquet_file in self._files():
+            file_columns = self._data_columns(parquet_file) if columns is None else columns
+            for i in range(parquet_file.num_row_groups):
+                yield parquet_file.read_row_group(i, columns=file_columns).to_pandas()
+
+    def freq(self,
+             cols,
+             thresh=100,
+             other_label='others',
+             clip_0=True,
+             value=None,
+             style=False,
+             sort_cols=False,
+             cum_cols=True):
+        """ Create the same table as df.stb.freq() while only reading cols and value.
+        See df.stb.freq() for the arguments
+        """
+        state = FreqState(cols, value=value)
+        _check_thresh(thresh)
+        for chunk in self._row_groups(cols + [value] if value else cols):
+            state.update(chunk)
+        return state.finalize(thresh=thresh,
+                              other_label=other_label,
+                              clip_0=clip_0,
+                              style=style,
+                              sort_cols=sort_cols,
+                              cum_cols=cum_cols)
+
+    def missing(self, clip_0=False, style=False, use_statistics=True):
+        """ Create the same table as df.stb.missing(). See df.stb.missing() for the arguments
+
+        Args:
+            use_statistics (bool): Default is True. Use the null counts in the footer of each
+                                   file and only read the columns that do not have them.
+                                   pandas and pyarrow store NaN as null so the counts match.
+                                   Set to False to read every column if the files were
+                                   written by a tool that stores NaN as a floating point value
+        """
+        state = MissingState()
+        for parquet_file in self._files():
+            columns = self._data_columns(parquet_file)
+            metadata = parquet_file.metadata
+            for i in range(parquet_file.num_row_groups):
+                row_group = metadata.row_group(i)
+                null_counts = {}
+                if use_statistics:
+                    for j in range(row_group.num_columns):
+                        column = row_group.column(j)
+                        stats = column.statistics
+                        # Nested columns have a longer path than the column name
+                        if (column.path_in_schema in columns and stats is not None and
+                                stats.has_null_count):
+                            null_counts[column.path_in_schema] = stats.null_count
+                to_read = [col for col in columns if col not in null_counts]
+                if to_read:
+                    chunk = parquet_file.read_row_group(i, columns=to_read).to_pandas()
+                    null_counts.update(chunk.isna().sum())
+                state._add(pd.Series([null_counts[col] for col in columns],
+                                     index=pd.Index(columns), dtype='int64'),
+                           row_group.num_rows)
+        if state.null_counts is None:
+            raise AttributeError('The parquet files do not contain any row groups')
+        return state.finalize(clip_0=clip_0, style=style)
+
+    def counts(self, include=None, exclude=None, sort_ascending=True, sort_col='unique'):
+        """ Create the same table as df.stb.counts() while only reading the selected columns.
+        See df.stb.counts() for the arguments
+        """
+        state = CountsState(include=include, exclude=exclude)
+        for parquet_file in self._files():
+            columns = self._data_columns(parquet_file)
+            if not (include == 'all' or ((include is None) and (exclude is None))):
+                # The dtypes of an empty frame decide which columns are read
+                empty = parquet_file.schema_arrow.empty_table().to_pandas()
+                columns = list(empty.select_dtypes(include=include, exclude=exclude).columns)
+            for i in range(parquet_file.num_row_groups):
+                state.update(parquet_file.read_row_group(i, columns=columns).to_pandas())
+        return state.finalize(sort_ascending=sort_ascending, sort_col=sort_col)
+
+
+def scan_parquet(path):
+    """ Summarize parquet data without loading it into memory. Only the columns needed by each
+    summary are read, one row group at a time.
+
+    Example:
+        sidetable.scan_parquet('events/').freq(['status'], thresh=80)
+        sidetable.scan_parquet('events/').missing()
+
+    Args:
+        path (str): Parquet file, directory that is searched for .parquet files or a
+                    list of them
+
+    Returns:
+        ParquetScan with freq(), missing() and counts() methods
+    """
+    return ParquetScan(_find_files(path))
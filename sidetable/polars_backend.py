@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Polars backend for the sidetable summaries.
+
+Importing this module registers a `stb` namespace on polars DataFrames. The counting is done
+by polars and only the small summary is converted to pandas so the tables have the same
+layout as the pandas accessor. Arrow tables can use it without a copy:
+
+    import polars as pl
+    import sidetable.polars_backend
+
+    pl.from_arrow(table).stb.freq(['class'])
+"""
+
+import pandas as pd
+import polars as pl
+
+from .sidetable import (_check_counts_args, _check_thresh, _counts_summary, _counts_table,
+                        _freq_table, _missing_table)
+
+
+def _is_float(dtype):
+    return dtype in (pl.Float32, pl.Float64)
+
+
+def _not_missing(name, dtype):
+    """ Internal helper with the polars expression for values pandas does not treat as NA """
+    expr = pl.col(name).is_not_null()
+    if _is_float(dtype):
+        expr = expr & pl.col(name).is_not_nan()
+    return expr
+
+
+@pl.api.register_dataframe_namespace('stb')
+class PolarsSideTable:
+    """Polars DataFrame namespace that computes the same summary tables as df.stb in pandas.
+    The results are pandas DataFrames.
+    """
+    def __init__(self, df):
+        self._df = df
+
+    def freq(self,
+             cols,
+             thresh=100,
+             other_label='others',
+             clip_0=True,
+             value=None,
+             style=False,
+             sort_cols=False,
+             cum_cols=True):
+        """ Create a frequency table. Only the groups that occur in the data are included.
+        See df.stb.freq() in pandas for the arguments
+
+        Returns:
+            pandas Dataframe that summarizes the number of occurrences of each value in the
+            provided columns or the sum of the data provided in the value parameter
+        """
+        if not isinstance(cols, list):
+            raise AttributeError('Must pass a list of columns')
+
+        if isinstance(value, list):
+            raise AttributeError('value must be a string not a list')
+
+        if value and value not in self._df.columns:
+            raise AttributeError('value must be a column name')
+
+        if value and not self._df.schema[value].is_numeric():
+            raise AttributeError(f'{value} must be a numeric column')
+
+        _check_thresh(thresh)
+
+        schema = self._df.schema
+        keys = pl.all_horizontal([_not_missing(col, schema[col]) for col in cols])
+        if value:
+            col_name = value
+            total = pl.col(value)
+            if _is_float(schema[value]):
+                # pandas skips NaN when summing
+                total = total.fill_nan(None)
+            agg = total.sum()
+        else:
+            col_name = 'count'
+            agg = pl.len().cast(pl.Int64).alias(col_name)
+        group_data = self._df.lazy().filter(keys).group_by(cols).agg(agg).collect()
+
+        return _freq_table(group_data.to_pandas(),
+                           cols,
+                           col_name,
+                           thresh=thresh,
+                           other_label=other_label,
+                           clip_0=clip_0,
+                           style=style,
+                           sort_cols=sort_cols,
+                           cum_cols=cum_cols)
+
+    def missing(self, clip_0=False, style=False):
+        """ Build table of missing data in each column. Nulls and floating point NaN are
+        both counted as missing. See df.stb.missing() in pandas for the arguments
+
+        Returns:
+            pandas DataFrame with each Column including total Missing Values, Percent Missing
+            and Total rows
+        """
+        schema = self._df.schema
+        null_counts = self._df.select([
+            (~_not_missing(col, dtype)).sum().cast(pl.Int64).alias(col)
+            for col, dtype in schema.items()
+        ])
+        null_counts = pd.Series(null_counts.row(0), index=pd.Index(self._df.columns),
+                                dtype='int64')
+        return _missing_table(null_counts, self._df.height, clip_0=clip_0, style=style)
+
+    def counts(self, include=None, exclude=None, sort_ascending=True, sort_col='unique'):
+        """ Build a table of total and unique values in a column. Every column is counted in
+        parallel by polars. include and exclude select the columns with the same rules as
+        pandas select_dtypes. See df.stb.counts() in pandas for the arguments
+
+        Returns:
+            pandas DataFrame with counts as well as unique values and most and least freq
+            counts
+        """
+        _check_counts_args(include, exclude, sort_col)
+
+        schema = self._df.schema
+        if include == 'all' or ((include is None) and (exclude is None)):
+            cols_to_use = list(self._df.columns)
+        else:
+            # The pandas dtypes of an empty frame decide which columns are selected
+            empty = self._df.head(0).to_pandas()
+            cols_to_use = list(empty.select_dtypes(include=include, exclude=exclude).columns)
+
+        # Values keep the order they are first seen so ties are broken like pandas
+        queries = [
+            self._df.lazy().filter(_not_missing(col, schema[col])).group_by(
+                col, maintain_order=True).agg(pl.len().cast(pl.Int64).alias('len'))
+            for col in cols_to_use
+        ]
+        tallies = [
+            pd.Series(tally['len'].to_numpy(), index=tally[col].to_pandas())
+            for col, tally in zip(cols_to_use, pl.collect_all(queries))
+        ]
+        if include == 'all' or ((include is None) and (exclude is None)):
+            # Filter out completely null columns
+            tallies = [(col, tally) for col, tally in zip(cols_to_use, tallies) if len(tally)]
+            cols_to_use = [col for col, _ in tallies]
+            tallies = [tally for _, tally in tallies]
+
+        results = [_counts_summary(tally) for tally in tallies]
+        return _counts_table(results, pd.Index(cols_to_use), sort_ascending, sort_col)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Opt-in timing of the internal phases of the sidetable summaries"""
+
+from collections import namedtuple
+import contextlib
+import functools
+import threading
+import time
+import tracemalloc
+
+PhaseTiming = namedtuple('PhaseTiming', ['method', 'phase', 'seconds', 'peak_bytes'])
+PhaseTiming.__doc__ = """Time spent in one phase of a df.stb method. peak_bytes is the most
+memory allocated by the phase above what was in use when it started, or None if memory is
+not measured. The phase named total covers the whole call"""
+
+_profiler = None
+_memory = False
+_started_tracemalloc = False
+_local = threading.local()
+
+
+def set_profiler(callback, memory=False):
+    """ Call callback with a PhaseTiming for each phase of every df.stb method, for example
+    to send the timings to a metrics system. Pass None to stop profiling. Nothing is
+    measured while no profiler is set.
+
+    Example:
+        sidetable.set_profiler(lambda timing: statsd.timing(
+            f'sidetable.{timing.method}.{timing.phase}', timing.seconds * 1000))
+
+    Args:
+        callback (callable): Function that takes a PhaseTiming or None to stop profiling
+        memory (bool):       Default is False. If True, tracemalloc is used to measure the
+                             peak memory of each phase. This makes the calls much slower
+    """
+    global _profiler, _memory, _started_tracemalloc
+    if callback is not None and not callable(callback):
+        raise AttributeError('callback must be callable or None')
+    if _started_tracemalloc and not (callback is not None and memory):
+        tracemalloc.stop()
+        _started_tracemalloc = False
+    if callback is not None and memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    _profiler = callback
+    _memory = callback is not None and memory and hasattr(tracemalloc, 'reset_peak')
+
+
+@contextlib.contextmanager
+def profile(memory=False):
+    """ Collect the phase timings of the df.stb calls made inside a with block
+
+    Example:
+        with sidetable.profile() as timings:
+            df.stb.freq(['class'], thresh=80)
+        pd.DataFrame(timings)
+
+    Args:
+        memory (bool): Default is False. If True, the peak memory of each phase is measured
+
+    Returns:
+        List of PhaseTiming that is filled in as the methods run
+    """
+    timings = []
+    previous = (_profiler, _memory)
+    set_profiler(timings.append, memory=memory)
+    try:
+        yield timings
+    finally:
+        set_profiler(*previous)
+
+
+class _NoPhase:
+    """Context manager used while profiling is off"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class _Phase:
+    """Context manager that times one phase and passes the result to the profiler"""
+    __slots__ = ('method', 'name', 'start', 'base', 'peak')
+
+    def __init__(self, method, name):
+        self.method = method
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        if _memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Resetting the peak would hide the allocations of the enclosing phase
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.base = self.peak = current
+        else:
+            self.base = None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        peak_bytes = None
+        if _memory and self.base is not None:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            peak_bytes = peak - self.base
+        callback = _profiler
+        if callback is not None:
+            callback(PhaseTiming(self.method, self.name, seconds, peak_bytes))
+        return False
+
+
+def phase(name):
+    """ Time one phase of the method that is running. Does nothing when no profiler is set """
+    if _profiler is None:
+        return _NO_PHASE
+    return _Phase(getattr(_local, 'method', None), name)
+
+
+def profiled(method):
+    """ Decorator for SideTableAccessor methods that times the whole call as the total phase
+    and names the phases inside it after the method
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if _profiler is None:
+            return method(*args, **kwargs)
+        outer = getattr(_local, 'method', None)
+        _local.method = method.__name__
+        try:
+            with _Phase(method.__name__, 'total'):
+                return method(*args, **kwargs)
+        finally:
+            _local.method = outer
+    return wrapper
@@ -1,12 +1,1138 @@
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pandas as pd
-from pandas.api.types import is_numeric_dtype
-from functools import reduce
+from pandas.api.types import is_numeric_dtype, is_integer_dtype, is_datetime64_any_dtype
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import os
 import warnings
 import weakref
 import math
-from operator import itemgetter
+import operator
+from functools import partial, reduce
+
+from .sketch import SpaceSaving, HyperLogLog
+from .cache import cached, forget
+from .profiling import phase, profiled
+
+# Number of rows grouped at a time when building an approximate frequency table
+_APPROX_CHUNK_ROWS = 1_000_000
+# Smallest number of groups where freq() searches for the top groups instead of sorting all
+# of them
+_TOP_GROUPS_MIN = 10_000
+# Smallest number of combined codes freq() will count with np.bincount. Larger data can use
+# up to twice as many codes as it has rows
+_CODE_BINS_MIN = 1 << 16
+# Number of rows checked at a time when counting missing values
+_MISSING_CHUNK_ROWS = 1 << 18
+# Number of rows drawn from at a time when sampling a fraction of the rows
+_SAMPLE_CHUNK_ROWS = 1 << 20
+# z score of the 95% confidence intervals for sampled estimates
+_CONFIDENCE_Z = 1.959963984540054
+
+
+def _factorize_column(col):
+    """ Internal helper that converts a column to integer codes in the order the values are
+    first seen. Categorical columns use their existing codes.
+
+    Args:
+        col (Series): Column of data
+
+    Returns:
+        Tuple of the codes (-1 for missing values) and an Index of the values for each code
+    """
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col.cat.codes.to_numpy(), col.cat.categories
+    codes, labels = pd.factorize(col)
+    return codes, pd.Index(labels)
+
+
+def _value_tally(col, factorized=None):
+    """ Internal helper that counts the occurrences of every value in a column with a single
+    pass over the data. Values are factorized once and counted with np.bincount.
+
+    Args:
+        col (Series):       Column of data to tally
+        factorized (tuple): Codes and labels from _factorize_column if they are already known
+
+    Returns:
+        Series of counts indexed by value in the same order value_counts() uses before sorting.
+        Missing values are not included. Unused categories are kept with a 0 count like
+        value_counts()
+    """
+    codes, labels = factorized if factorized is not None else _factorize_column(col)
+    tally = np.bincount(codes[codes >= 0], minlength=len(labels))
+    return pd.Series(tally, index=labels)
+
+
+def _counts_summary(tally):
+    """ Internal helper to build one row of the counts() table from a value tally
+
+    Args:
+        tally (Series): Count of each value in the column. See _value_tally
+
+    Returns:
+        Tuple with count, unique, most_freq, most_freq_count, least_freq, least_freq_count
+    """
+    # Sorting only the distinct values keeps the tie breaking identical to value_counts()
+    ranked = tally.sort_values(ascending=False)
+    return (int(tally.sum()), int((tally > 0).sum()), ranked.idxmax(), ranked.max(),
+            ranked.idxmin(), ranked.min())
+
+
+def _counts_block(obj, positions):
+    """ Internal helper that builds the counts() rows for a block of column positions """
+    return [_counts_summary(_value_tally(obj.iloc[:, i])) for i in positions]
+
+
+def _null_count(col):
+    """ Internal helper that counts the missing values in a column. The values are checked a
+    chunk of rows at a time so a mask for the whole column is never built.
+
+    Args:
+        col (Series): Column of data
+
+    Returns:
+        Number of missing values
+    """
+    dtype = col.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biu':
+        # Integer and boolean arrays can not hold missing values
+        return 0
+    # pd.ArrowDtype was added in pandas 1.5
+    arrow_dtype = getattr(pd, 'ArrowDtype', None)
+    if arrow_dtype is not None and isinstance(dtype, arrow_dtype):
+        # Arrow keeps a count of the nulls in its validity bitmap
+        return col.array.__arrow_array__().null_count
+    is_missing = pd.isna
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Missing categories have a code of -1
+        values = col.cat.codes.to_numpy()
+        is_missing = partial(np.greater, 0)
+    elif isinstance(dtype, np.dtype):
+        values = col.to_numpy()
+    else:
+        values = col.array
+    return sum(int(is_missing(values[start:start + _MISSING_CHUNK_ROWS]).sum())
+               for start in range(0, len(values), _MISSING_CHUNK_ROWS))
+
+
+def _missing_block(obj, positions):
+    """ Internal helper that counts the missing values for a block of column positions """
+    return pd.Series([_null_count(obj.iloc[:, i]) for i in positions],
+                     index=obj.columns[list(positions)],
+                     dtype='int64')
+
+
+def _sample_rows(obj, sample, random_state=None):
+    """ Internal helper that draws a random sample of rows without replacement
+
+    Args:
+        obj (DataFrame):    Data to sample
+        sample (float):     Fraction of the rows when a float up to 1.0, where 1.0 keeps every
+                            row. Otherwise the number of rows. A fraction keeps each row with
+                            that probability so the rows are drawn one chunk at a time
+        random_state (int): Seed for the random number generator
+
+    Returns:
+        DataFrame with the sampled rows in their original order
+    """
+    if isinstance(sample, bool) or not isinstance(sample, (int, float)) or not sample > 0:
+        raise AttributeError('sample must be a fraction between 0 and 1 or a number of rows')
+    if isinstance(sample, float) and sample > 1 and not sample.is_integer():
+        raise AttributeError('sample must be a fraction between 0 and 1 or a whole number of '
+                             'rows')
+    rng = np.random.default_rng(random_state)
+    num_rows = len(obj)
+    if isinstance(sample, float) and sample == 1:
+        # A fraction of 1.0 is every row, not a single row
+        return obj
+    if sample < 1:
+        positions = np.concatenate([np.empty(0, dtype=np.intp)] + [
+            start + np.flatnonzero(rng.random(min(_SAMPLE_CHUNK_ROWS, num_rows - start)) < sample)
+            for start in range(0, num_rows, _SAMPLE_CHUNK_ROWS)
+        ])
+    elif sample >= num_rows:
+        return obj
+    else:
+        positions = np.sort(rng.choice(num_rows, int(sample), replace=False))
+    if len(positions) == 0:
+        raise AttributeError('The sample does not contain any rows. Use a larger sample')
+    return obj.take(positions)
+
+
+def _wilson_interval(successes, trials, population):
+    """ Internal helper with the 95% Wilson score interval of a proportion. The interval is
+    exact when every row was sampled.
+
+    Args:
+        successes (array): Number of sampled rows that meet the condition
+        trials (int):      Number of sampled rows
+        population (int):  Number of rows in the data
+
+    Returns:
+        Tuple of the lower and upper bounds as proportions
+    """
+    proportion = np.asarray(successes, dtype=float) / trials
+    if trials >= population:
+        return proportion, proportion
+    z_squared = _CONFIDENCE_Z**2
+    center = (proportion + z_squared / (2 * trials)) / (1 + z_squared / trials)
+    half_width = (_CONFIDENCE_Z * np.sqrt(proportion * (1 - proportion) / trials +
+                                          z_squared / (4 * trials**2)) /
+                  (1 + z_squared / trials))
+    return np.clip(center - half_width, 0, 1), np.clip(center + half_width, 0, 1)
+
+
+def _sampled_counts_summary(tally, scale):
+    """ Internal helper to estimate one row of the counts() table from the tally of a sample.
+    The number of unique values uses the bias corrected Chao1 estimator which adds unseen
+    values based on how many values were seen once and twice. The bounds are the values seen
+    in the sample and every value seen once standing for scale values in the data.
+
+    Args:
+        tally (Series): Count of each value in the sample. See _value_tally
+        scale (float):  Number of rows in the data for each sampled row
+
+    Returns:
+        Tuple with count, unique, most_freq, most_freq_count, least_freq, least_freq_count,
+        unique_low and unique_high
+    """
+    count, seen, most_freq, most_freq_count, least_freq, least_freq_count = (
+        _counts_summary(tally))
+    singles = int((tally == 1).sum())
+    doubles = int((tally == 2).sum())
+    count = int(round(count * scale))
+    unique_high = max(min(int(round(singles * scale)) + seen - singles, count), seen)
+    unseen = singles * (singles - 1) / (2 * (doubles + 1))
+    unique = min(int(round(seen + unseen)), unique_high)
+    return (count, unique, most_freq, int(round(most_freq_count * scale)), least_freq,
+            int(round(least_freq_count * scale)), seen, unique_high)
+
+
+def _sampled_counts_block(obj, positions, scale):
+    """ Internal helper that estimates the counts() rows for a block of sampled columns """
+    return [_sampled_counts_summary(_value_tally(obj.iloc[:, i]), scale) for i in positions]
+
+
+def _approx_counts_summary(col, precision=14):
+    """ Internal helper to build one row of the counts() table with bounded memory. The
+    column is read one chunk of rows at a time. The unique values are estimated with a
+    HyperLogLog sketch and the most frequent value with a Space-Saving sketch. The least
+    frequent value can not be found without tracking every value so it is left empty.
+
+    Args:
+        col (Series):     Column of data
+        precision (int):  HyperLogLog precision. See HyperLogLog
+
+    Returns:
+        Tuple with count, unique, most_freq, most_freq_count, least_freq, least_freq_count
+    """
+    distinct = HyperLogLog(precision)
+    top = SpaceSaving()
+    # The sketches track the hash of each value. Keep one value for every hash they track
+    labels = {}
+    count = 0
+    for start in range(0, len(col), _APPROX_CHUNK_ROWS):
+        chunk = col.iloc[start:start + _APPROX_CHUNK_ROWS]
+        chunk = chunk[chunk.notna()]
+        count += len(chunk)
+        hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        distinct.update_hashes(hashes)
+        chunk_hashes, first, chunk_counts = np.unique(hashes, return_index=True,
+                                                      return_counts=True)
+        top.update(pd.Series(chunk_counts, index=chunk_hashes))
+        if top.counts is not None:
+            new_hashes = [key for key in top.counts.index if key not in labels]
+            positions = first[np.searchsorted(chunk_hashes, new_hashes)]
+            labels.update(zip(new_hashes, chunk.iloc[positions]))
+    if count == 0:
+        return (0, 0, None, 0, None, None)
+    most = top.top()
+    unique = min(max(distinct.estimate(), 1), count)
+    return (count, unique, labels[most.index[0]], int(most['count'].iloc[0]), None, None)
+
+
+def _approx_counts_block(obj, positions, precision=14):
+    """ Internal helper that builds the approximate counts() rows for a block of columns """
+    return [_approx_counts_summary(obj.iloc[:, i], precision) for i in positions]
+
+
+def _map_column_blocks(obj, positions, func, n_jobs=1, backend='threads'):
+    """ Internal helper to apply a function to blocks of columns, optionally in parallel.
+    Columns are passed by position so duplicate column names are handled.
+
+    Args:
+        obj (DataFrame):  Data that contains the columns
+        positions (list): Positions of the columns to process
+        func (callable):  Function called as func(obj, block_positions) that returns the
+                          results for the block of columns
+        n_jobs (int):     Number of workers. -1 uses all available cores
+        backend (str):    'threads' or 'processes'
+
+    Returns:
+        List with the result of func for each block in column order
+    """
+    if backend not in ['threads', 'processes']:
+        raise ValueError("backend must be one of ['threads', 'processes']")
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if not isinstance(n_jobs, int) or n_jobs < 1:
+        raise ValueError('n_jobs must be a positive integer or -1')
+    positions = list(positions)
+    if n_jobs == 1 or len(positions) <= 1:
+        return [func(obj, positions)]
+    # Use a few blocks per worker so uneven columns do not leave workers idle
+    n_blocks = min(len(positions), n_jobs * 4)
+    bounds = np.linspace(0, len(positions), n_blocks + 1).astype(int)
+    blocks = [positions[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    if backend == 'threads':
+        # Threads share the DataFrame so no data is copied
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(lambda block: func(obj, block), blocks))
+    # Processes only receive the columns in their own block
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        # map returns the results in submission order so the merge is deterministic
+        return list(executor.map(func, (obj.iloc[:, block] for block in blocks),
+                                 (range(len(block)) for block in blocks)))
+
+
+def _check_thresh(thresh):
+    """ Internal helper to validate the freq() threshold """
+    if thresh > 100:
+        raise AttributeError('Thresh must be <= 100')
+
+    if thresh <= 1:
+        warnings.warn(
+            f'thresh should be expressed as a percentage. Did you mean {int(thresh*100)}?'
+        )
+
+
+def _top_groups(group_data, cols, col_name, thresh):
+    """ Internal helper that finds the largest groups needed to reach the threshold
+    without sorting all of the groups by every column. Only the groups at least as
+    large as the first group over the threshold are sorted.
+
+    Args:
+        group_data (DataFrame): One row per group with the cols and the col_name aggregate
+        cols (list):            Column names that were grouped together
+        col_name (str):         Name of the count or summed value column
+        thresh (float):         Threshold percentage
+
+    Returns:
+        Tuple of the sorted groups that are within the threshold and the overall total or
+        None if the full sort should be used
+    """
+    values = group_data[col_name].to_numpy()
+    num_groups = len(values)
+    if num_groups < _TOP_GROUPS_MIN or not is_numeric_dtype(values):
+        return None
+    # Negative values mean the cumulative total is not always increasing
+    if np.isnan(values).any() or values.min() < 0:
+        return None
+    total = values.sum()
+    if total == 0:
+        return None
+
+    # Sorting the bare values is much cheaper than sorting the groups by every column.
+    # Find the value of the first group that is over the threshold
+    ordered = np.sort(values)[::-1]
+    position = np.searchsorted(ordered.cumsum() / total * 100, thresh, side='right')
+    if position >= num_groups:
+        return None
+
+    # Include every group tied with the smallest candidate so the order matches a full sort.
+    # One extra group allows for rounding in the cumulative sum of the unordered ties
+    candidates = values >= ordered[min(position + 1, num_groups - 1)]
+    if candidates.sum() > num_groups // 2:
+        return None
+    candidates = group_data[candidates].sort_values([col_name] + cols,
+                                                    ascending=False).reset_index(drop=True)
+    cumulative_percent = candidates[col_name].cumsum() / total * 100
+    return candidates[cumulative_percent <= thresh].copy(), total
+
+
+def _column_codes(col):
+    """ Internal helper that converts a categorical or integer column to integer codes
+
+    Args:
+        col (Series): Column of data
+
+    Returns:
+        Tuple of the codes (-1 for missing), number of codes and a function that maps codes
+        back to values or None if the column can not be coded cheaply
+    """
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        dtype = col.dtype
+        return (col.cat.codes.to_numpy(), len(dtype.categories),
+                lambda codes: pd.Categorical.from_codes(codes, dtype=dtype))
+    if is_integer_dtype(col.dtype) and isinstance(col.dtype, np.dtype) and len(col) > 0:
+        values = col.to_numpy()
+        low, high = int(values.min()), int(values.max())
+        # uint64 values above the intp maximum can not be coded
+        if high > np.iinfo(np.intp).max or high - low >= len(col) * 2 + _CODE_BINS_MIN:
+            return None
+        # Cast first so narrow integer types can not overflow
+        return (values.astype(np.intp) - low, high - low + 1,
+                lambda codes: (codes + low).astype(values.dtype))
+    return None
+
+
+def _code_group_data(obj, cols, value=None, coded=None, dropna=True):
+    """ Internal helper that counts (or sums) the groups of categorical and integer columns
+    with np.bincount on their combined codes. The values are only looked up for the final
+    groups. The groups match obj.groupby(cols, observed=False)
+
+    Args:
+        obj (DataFrame):  Data to group
+        cols (list):      Column names that will be grouped together
+        value (str):      float64 column that will be summed instead of counting the rows
+        coded (list):     Codes, number of codes and value lookup for each column if they are
+                          already known. See _column_codes
+        dropna (bool):    If False, missing values are grouped by groupby instead
+
+    Returns:
+        DataFrame with one row per group and the count or value column or None if the
+        columns can not be coded cheaply
+    """
+    if value and obj[value].dtype != np.float64:
+        # Integer sums need to stay exact so they are left to groupby
+        return None
+    if len(set(cols)) != len(cols):
+        return None
+    if coded is None:
+        coded = [_column_codes(obj[col]) for col in cols]
+        if any(col_codes is None for col_codes in coded):
+            return None
+    sizes = [size for _, size, _ in coded]
+    # Python ints keep the product exact. math.prod needs Python 3.8
+    num_bins = reduce(operator.mul, sizes, 1)
+    has_category = any(isinstance(obj[col].dtype, pd.CategoricalDtype) for col in cols)
+
+    # Missing categories are not part of any group
+    valid = np.ones(len(obj), dtype=bool)
+    for codes, _, _ in coded:
+        valid &= codes >= 0
+    if not dropna and not valid.all():
+        return None
+    if 0 < num_bins <= max(len(obj) * 2, _CODE_BINS_MIN):
+        combined = np.ravel_multi_index([codes[valid] for codes, _, _ in coded], sizes)
+        counts = np.bincount(combined, minlength=num_bins)
+    elif not has_category and 0 < num_bins < 2**62:
+        # Too many combinations for one bin each so only the observed ones are numbered
+        combined, observed = pd.factorize(
+            np.ravel_multi_index([codes[valid] for codes, _, _ in coded], sizes))
+        counts = np.bincount(combined, minlength=len(observed))
+    else:
+        return None
+
+    if has_category:
+        # Every category is included along with the values of the other columns
+        keep = np.ones(sizes, dtype=bool)
+        for dim, (col, (codes, size, _)) in enumerate(zip(cols, coded)):
+            if not isinstance(obj[col].dtype, pd.CategoricalDtype):
+                shape = [1] * len(sizes)
+                shape[dim] = size
+                # Factorized codes use -1 for missing values
+                keep &= (np.bincount(codes[codes >= 0], minlength=size) > 0).reshape(shape)
+        keep = np.flatnonzero(keep)
+        group_codes = np.unravel_index(keep, sizes)
+    elif len(counts) < num_bins:
+        keep = np.arange(len(counts))
+        group_codes = np.unravel_index(observed, sizes)
+    else:
+        keep = np.flatnonzero(counts)
+        group_codes = np.unravel_index(keep, sizes)
+
+    group_data = pd.DataFrame({
+        col: to_values(codes)
+        for col, codes, (_, _, to_values) in zip(cols, group_codes, coded)
+    })
+    if value:
+        weights = obj[value].to_numpy()[valid]
+        totals = np.bincount(combined, weights=np.where(np.isnan(weights), 0, weights),
+                             minlength=len(counts))
+        group_data[value] = totals[keep]
+    else:
+        group_data['count'] = counts[keep].astype(np.int64)
+    return group_data
+
+
+def _freq_group_data(obj, cols, value=None, coded=None, dropna=True):
+    """ Internal helper that counts (or sums) each group for freq()
+
+    Args:
+        obj (DataFrame):  Data to group
+        cols (list):      Column names that will be grouped together
+        value (str):      Column that will be summed instead of counting the rows
+        coded (list):     Codes for each column if they are already known. See _column_codes
+        dropna (bool):    If False, missing values in cols are counted as their own group
+
+    Returns:
+        DataFrame with one row per group and the count or value column
+    """
+    # Categorical and integer columns are counted from their codes
+    group_data = _code_group_data(obj, cols, value, coded, dropna)
+    if group_data is not None:
+        return group_data
+    grouped = obj.groupby(cols, observed=False, dropna=dropna)
+    if value:
+        return grouped.agg({value: 'sum'}).reset_index()
+    return grouped.size().reset_index(name='count')
+
+
+def _check_freq_args(obj, cols, value, thresh):
+    """ Internal helper to validate the freq() arguments """
+    if not isinstance(cols, list):
+        raise AttributeError('Must pass a list of columns')
+
+    if isinstance(value, list):
+        raise AttributeError('value must be a string not a list')
+
+    if value and value not in obj.columns:
+        raise AttributeError('value must be a column name')
+
+    if value and not is_numeric_dtype(obj[value]):
+        raise AttributeError(f'{value} must be a numeric column')
+
+    _check_thresh(thresh)
+
+
+def _check_metric_args(obj, cols, value, weights, sort_metric, thresh):
+    """ Internal helper to validate freq() with a list of values or weights
+
+    Returns:
+        List with the name of each metric column in the table
+    """
+    if not isinstance(cols, list):
+        raise AttributeError('Must pass a list of columns')
+
+    values = value if isinstance(value, list) else [value] if value else []
+    if isinstance(value, list) and not value:
+        raise AttributeError('value must contain at least one column name')
+
+    for col in values + ([weights] if weights is not None else []):
+        if col not in obj.columns:
+            raise AttributeError(f'{col} must be a column name')
+        if not is_numeric_dtype(obj[col]):
+            raise AttributeError(f'{col} must be a numeric column')
+
+    metrics = values if values else ['count']
+    if sort_metric is not None and sort_metric not in metrics:
+        raise AttributeError(f'sort_metric must be one of {metrics}')
+
+    _check_thresh(thresh)
+    return metrics
+
+
+def _metric_group_data(obj, cols, values, weights=None, dropna=True):
+    """ Internal helper that sums several metrics for each group with one groupby
+
+    Args:
+        obj (DataFrame): Data to group
+        cols (list):     Column names that will be grouped together
+        values (list):   Columns that will be summed. If empty the rows are counted
+        weights (str):   Column that each row is weighted by. Default is None
+        dropna (bool):   If False, missing values in cols are counted as their own group
+
+    Returns:
+        DataFrame with one row per group and a column for each metric
+    """
+    weight = obj[weights] if weights is not None else None
+    if values:
+        metrics = {col: obj[col] if weight is None else obj[col] * weight for col in values}
+    else:
+        metrics = {'count': weight}
+    return (pd.DataFrame(metrics, index=obj.index)
+            .groupby([obj[col] for col in cols], observed=False, dropna=dropna)
+            .sum()
+            .reset_index())
+
+
+def _check_na_label(group_data, cols, na_label):
+    """ Internal helper that makes sure na_label is not already a value in a grouped column
+    with missing values. Otherwise the missing group could not be told apart from the real one
+    """
+    for col in cols:
+        values = group_data[col]
+        if values.isna().any() and (values == na_label).any():
+            raise AttributeError(
+                f'na_label {na_label!r} is already a value in {col!r}. Use a different na_label')
+
+
+def _label_missing(results, cols, na_label):
+    """ Internal helper that replaces the missing values in the grouped columns with na_label.
+    Categorical columns keep their dtype and have na_label added as a category
+
+    Args:
+        results (DataFrame): Frequency table
+        cols (list):         Column names that were grouped together
+        na_label (str):      Label used for the missing values
+
+    Returns:
+        DataFrame with the labels
+    """
+    missing = [col for col in cols if results[col].isna().any()]
+    if not missing:
+        return results
+    results = results.copy()
+    for col in missing:
+        if isinstance(results[col].dtype, pd.CategoricalDtype):
+            if na_label not in results[col].cat.categories:
+                results[col] = results[col].cat.add_categories([na_label])
+        else:
+            results[col] = results[col].astype(object)
+        results[col] = results[col].fillna(na_label)
+    return results
+
+
+def _append_others(results, all_others, cols, other_label):
+    """ Internal helper that adds the others footer row to the bottom of a frequency table.
+    Categorical columns keep their dtype and have other_label added as a category
+
+    Args:
+        results (DataFrame):    Frequency table
+        all_others (DataFrame): Footer rows without the grouped columns
+        cols (list):            Column names that were grouped together
+        other_label (str):      Label used for the grouped columns in the footer
+
+    Returns:
+        DataFrame with the footer row
+    """
+    results = results.copy()
+    all_others = all_others.copy()
+    for col in results[cols].select_dtypes(['category']).columns:
+        if other_label not in results[col].cat.categories:
+            results[col] = results[col].cat.add_categories([other_label])
+        all_others[col] = pd.Categorical([other_label] * len(all_others),
+                                         dtype=results[col].dtype)
+    return pd.concat([results, all_others],
+                     ignore_index=True).fillna(dict.fromkeys(cols, other_label))
+
+
+def _freq_table(group_data,
+                cols,
+                col_name,
+                thresh=100,
+                other_label='others',
+                clip_0=True,
+                style=False,
+                sort_cols=False,
+                cum_cols=True,
+                na_label=None):
+    """ Internal helper that turns aggregated group data into the freq() table. This is
+    shared by all the ways a frequency table can be built.
+
+    Args:
+        group_data (DataFrame): One row per group with the cols and the col_name aggregate
+        cols (list):            Column names that were grouped together
+        col_name (str):         Name of the count or summed value column
+        na_label (str):         Label for missing values in the groups. Default is None to
+                                leave them as they are
+        See freq() for the remaining arguments
+
+    Returns:
+        Dataframe (or Styler) with the frequency table
+    """
+    if na_label is not None:
+        _check_na_label(group_data, cols, na_label)
+    with phase('sort'):
+        top_groups = None
+        if thresh < 100 and not sort_cols:
+            top_groups = _top_groups(group_data, cols, col_name, thresh)
+
+        if top_groups is not None:
+            # Only the groups needed to reach the threshold were sorted
+            results, total = top_groups
+            results['percent'] = (results[col_name] / total) * 100
+            results[f'cumulative_{col_name}'] = results[col_name].cumsum()
+            results['cumulative_percent'] = (results[f'cumulative_{col_name}'] /
+                                             total) * 100
+            other_total = total - results[col_name].sum()
+        else:
+            # Sort the results either by the grouped column(s) or numeric values
+            # cleanup the index
+            if sort_cols:
+                results = group_data.sort_values(
+                    cols, ascending=True).reset_index(drop=True)
+            else:
+                results = group_data.sort_values(
+                    [col_name] + cols, ascending=False).reset_index(drop=True)
+
+            # In data with null values, can include 0 counts filter them out by default
+            if clip_0:
+                results = results[results[col_name] > 0]
+
+            # Include percents
+            total = results[col_name].sum()
+            results['percent'] = (results[col_name] / total) * 100
+
+            # Keep track of cumulative counts or totals as well as their relative percent
+            results[f'cumulative_{col_name}'] = results[col_name].cumsum()
+            results['cumulative_percent'] = (results[f'cumulative_{col_name}'] /
+                                             total) * 100
+
+            if thresh < 100:
+                # Flag the All Other rows and calculate their total amount
+                is_other = results['cumulative_percent'] > thresh
+                other_total = results.loc[is_other, col_name].sum()
+                results = results[~is_other]
+
+    if na_label is not None:
+        results = _label_missing(results, cols, na_label)
+
+    # cutoff is a percentage below which all values are grouped together in an
+    # others category
+    if thresh < 100:
+        with phase('thresh'):
+            other_pct = (other_total / total) * 100
+
+            # Create the footer row to append to the results
+            all_others = pd.DataFrame({
+                col_name: [other_total],
+                'percent': [other_pct],
+                f'cumulative_{col_name}': [total],
+                'cumulative_percent': [100.0]
+            })
+            results = _append_others(results, all_others, cols, other_label)
+    if not cum_cols:
+        results = results.drop(
+            columns=['cumulative_percent', f'cumulative_{col_name}'])
+    if style:
+        format_dict = {
+            'percent': '{:.2f}%',
+            'cumulative_percent': '{:.2f}%',
+            'count': '{0:,.0f}',
+            f'{col_name}': '{0:,.0f}',
+            f'cumulative_{col_name}': '{0:,.0f}'
+        }
+        with phase('style'):
+            return results.style.format(format_dict)
+    else:
+        return results
+
+
+def _multi_freq_table(group_data,
+                      cols,
+                      metrics,
+                      sort_metric,
+                      thresh=100,
+                      other_label='others',
+                      clip_0=True,
+                      style=False,
+                      sort_cols=False,
+                      cum_cols=True,
+                      na_label=None):
+    """ Internal helper that builds the freq() table for several metrics. Each metric gets
+    percent_, cumulative_ and cumulative_percent_ columns and sort_metric decides the order,
+    the clip_0 filter and the thresh cutoff
+
+    Args:
+        group_data (DataFrame): One row per group with the cols and every metric
+        metrics (list):         Names of the metric columns
+        sort_metric (str):      Metric used to sort and apply the threshold
+        na_label (str):         Label for missing values in the groups
+        See freq() for the remaining arguments
+
+    Returns:
+        Dataframe (or Styler) with the frequency table
+    """
+    if na_label is not None:
+        _check_na_label(group_data, cols, na_label)
+    if sort_cols:
+        results = group_data.sort_values(cols, ascending=True).reset_index(drop=True)
+    else:
+        results = group_data.sort_values([sort_metric] + cols,
+                                         ascending=False).reset_index(drop=True)
+    if clip_0:
+        results = results[results[sort_metric] > 0]
+
+    columns = list(cols)
+    totals = {}
+    for metric in metrics:
+        totals[metric] = results[metric].sum()
+        results[f'percent_{metric}'] = (results[metric] / totals[metric]) * 100
+        results[f'cumulative_{metric}'] = results[metric].cumsum()
+        results[f'cumulative_percent_{metric}'] = (results[f'cumulative_{metric}'] /
+                                                   totals[metric]) * 100
+        columns += [metric, f'percent_{metric}', f'cumulative_{metric}',
+                    f'cumulative_percent_{metric}']
+    results = results[columns]
+    if na_label is not None:
+        results = _label_missing(results, cols, na_label)
+
+    if thresh < 100:
+        is_other = results[f'cumulative_percent_{sort_metric}'] > thresh
+        footer = {}
+        for metric in metrics:
+            other_total = results.loc[is_other, metric].sum()
+            footer[metric] = [other_total]
+            footer[f'percent_{metric}'] = [(other_total / totals[metric]) * 100]
+            footer[f'cumulative_{metric}'] = [totals[metric]]
+            footer[f'cumulative_percent_{metric}'] = [100.0]
+        results = _append_others(results[~is_other], pd.DataFrame(footer), cols, other_label)
+    if not cum_cols:
+        results = results.drop(columns=[
+            col for metric in metrics
+            for col in (f'cumulative_{metric}', f'cumulative_percent_{metric}')
+        ])
+    if style:
+        format_dict = {}
+        for metric in metrics:
+            format_dict.update({
+                f'percent_{metric}': '{:.2f}%',
+                f'cumulative_percent_{metric}': '{:.2f}%',
+                metric: '{0:,.0f}',
+                f'cumulative_{metric}': '{0:,.0f}'
+            })
+        return results.style.format(format_dict)
+    else:
+        return results
+
+
+def _window_bins(obj, window, on=None):
+    """ Internal helper that labels each row with the start of its time window
+
+    Args:
+        obj (DataFrame): Data with a datetime column or index
+        window (str):    Fixed frequency of the windows such as '1h' or '1D'
+        on (str):        Datetime column. Default is None to use the index
+
+    Returns:
+        Series with the start of the window of each row named after the column or index
+    """
+    if on is None:
+        times = obj.index
+        name = times.name if times.name is not None else 'window'
+    else:
+        if on not in obj.columns:
+            raise AttributeError('on must be a column name')
+        times = obj[on]
+        name = on
+    if not is_datetime64_any_dtype(times):
+        raise AttributeError('window needs a datetime index or a datetime column passed as on')
+    try:
+        starts = times.dt.floor(window) if on is not None else times.floor(window)
+    except ValueError:
+        raise AttributeError(f'window must be a fixed frequency such as 1h or 1D not {window}')
+    return pd.Series(np.asarray(starts), index=obj.index, name=name)
+
+
+def _windowed_freq_table(obj,
+                         cols,
+                         value,
+                         bins,
+                         thresh=100,
+                         other_label='others',
+                         clip_0=True,
+                         style=False,
+                         sort_cols=False,
+                         cum_cols=True):
+    """ Internal helper that builds a freq() table for every time window with one groupby.
+    The percents and cumulative values start over in each window
+
+    Args:
+        bins (Series): Start of the window of each row from _window_bins()
+        See freq() for the remaining arguments
+
+    Returns:
+        Dataframe (or Styler) with the window followed by the freq() columns
+    """
+    window = bins.name
+    col_name = value if value else 'count'
+    grouped = obj.groupby([bins] + [obj[col] for col in cols], observed=False)
+    group_data = (grouped[value].sum() if value else grouped.size()).rename(col_name)
+    group_data = group_data.reset_index()
+
+    # One sort orders the windows and the groups inside each window
+    if sort_cols:
+        results = group_data.sort_values([window] + cols, kind='stable')
+    else:
+        results = group_data.sort_values([window, col_name] + cols,
+                                         ascending=[True] + [False] * (len(cols) + 1),
+                                         kind='stable')
+    if clip_0:
+        results = results[results[col_name] > 0]
+    results = results.reset_index(drop=True)
+
+    by_window = results.groupby(window, sort=False)[col_name]
+    total = by_window.transform('sum')
+    results['percent'] = (results[col_name] / total) * 100
+    results[f'cumulative_{col_name}'] = by_window.cumsum()
+    results['cumulative_percent'] = (results[f'cumulative_{col_name}'] / total) * 100
+
+    if thresh < 100:
+        # Every window gets an others row with the total of the groups after its cutoff
+        is_other = results['cumulative_percent'] > thresh
+        windows = results[window].drop_duplicates()
+        window_total = by_window.sum().reindex(windows)
+        other_total = (results.loc[is_other].groupby(window)[col_name].sum()
+                       .reindex(windows, fill_value=0))
+        all_others = pd.DataFrame({
+            window: windows.to_numpy(),
+            col_name: other_total.to_numpy(),
+            'percent': (other_total / window_total * 100).to_numpy(),
+            f'cumulative_{col_name}': window_total.to_numpy(),
+            'cumulative_percent': 100.0
+        })
+        results = _append_others(results[~is_other], all_others, cols, other_label)
+        results = results.sort_values(window, kind='stable').reset_index(drop=True)
+    results = results[[window] + cols + [col_name, 'percent', f'cumulative_{col_name}',
+                                         'cumulative_percent']]
+    if not cum_cols:
+        results = results.drop(
+            columns=['cumulative_percent', f'cumulative_{col_name}'])
+    if style:
+        format_dict = {
+            'percent': '{:.2f}%',
+            'cumulative_percent': '{:.2f}%',
+            'count': '{0:,.0f}',
+            f'{col_name}': '{0:,.0f}',
+            f'cumulative_{col_name}': '{0:,.0f}'
+        }
+        return results.style.format(format_dict)
+    else:
+        return results
+
+
+def _approx_freq_table(sketch,
+                       cols,
+                       col_name,
+                       thresh=100,
+                       other_label='others',
+                       clip_0=True,
+                       style=False,
+                       sort_cols=False,
+                       cum_cols=True):
+    """ Internal helper that builds an approximate freq() table from a SpaceSaving sketch.
+    Percentages are based on the exact total. Groups that are not tracked, or are beyond
+    the threshold, are combined into the others row.
+
+    Args:
+        sketch (SpaceSaving): Sketch of the group counts or sums
+        cols (list):          Column names that were grouped together
+        col_name (str):       Name of the count or summed value column
+        See freq() for the remaining arguments
+
+    Returns:
+        Dataframe (or Styler) with the frequency table and an error column
+    """
+    error_name = f'{col_name}_error'
+    top = sketch.top()
+    if sketch.counts is None:
+        results = pd.DataFrame(columns=cols)
+    else:
+        results = top.index.to_frame(index=False)
+        results.columns = cols
+    results[col_name] = top['count'].to_numpy()
+    results[error_name] = top['error'].to_numpy()
+
+    if sort_cols:
+        results = results.sort_values(cols, ascending=True).reset_index(drop=True)
+    else:
+        results = results.sort_values([col_name] + cols,
+                                      ascending=False).reset_index(drop=True)
+
+    total = sketch.total
+    results['percent'] = (results[col_name] / total) * 100
+    results[f'cumulative_{col_name}'] = results[col_name].cumsum()
+    results['cumulative_percent'] = (results[f'cumulative_{col_name}'] / total) * 100
+    if thresh < 100:
+        results = results[results['cumulative_percent'] <= thresh]
+
+    # Everything that is not listed belongs to the others. The listed values are upper
+    # bounds so the others total can be low by as much as their combined error
+    other_total = max(total - results[col_name].sum(), 0)
+    if other_total > 0 or not clip_0:
+        all_others = pd.DataFrame({
+            col_name: [other_total],
+            error_name: [results[error_name].sum()],
+            'percent': [(other_total / total) * 100],
+            f'cumulative_{col_name}': [total],
+            'cumulative_percent': [100.0]
+        })
+        results = _append_others(results, all_others, cols, other_label)
+
+    results = results[cols + [col_name, 'percent', f'cumulative_{col_name}',
+                              'cumulative_percent', error_name]]
+    if not cum_cols:
+        results = results.drop(
+            columns=['cumulative_percent', f'cumulative_{col_name}'])
+    if style:
+        format_dict = {
+            'percent': '{:.2f}%',
+            'cumulative_percent': '{:.2f}%',
+            f'{col_name}': '{0:,.0f}',
+            f'cumulative_{col_name}': '{0:,.0f}',
+            error_name: '{0:,.0f}'
+        }
+        return results.style.format(format_dict)
+    else:
+        return results
+
+
+def _missing_table(null_counts, total, clip_0=False, style=False, interval=None):
+    """ Internal helper that builds the missing() table from the null counts of each column
+
+    Args:
+        null_counts (Series): Number of missing values indexed by column name
+        total (int):          Total number of rows
+        interval (tuple):     Lower and upper bounds of the percent missing for sampled data
+        See missing() for the remaining arguments
+
+    Returns:
+        DataFrame (or Styler) with the missing table
+    """
+    missing = null_counts.to_frame(name='missing')
+    missing['percent'] = null_counts / total * 100
+    missing['total'] = total
+    columns = ['missing', 'total', 'percent']
+    if interval is not None:
+        missing['percent_low'], missing['percent_high'] = interval
+        columns += ['percent_low', 'percent_high']
+    if clip_0:
+        missing = missing[missing['missing'] > 0]
+
+    results = missing[columns].sort_values(by=['missing'], ascending=False)
+    if style:
+        format_dict = {
+            'percent': '{:.2f}%',
+            'percent_low': '{:.2f}%',
+            'percent_high': '{:.2f}%',
+            'total': '{0:,.0f}',
+            'missing': '{0:,.0f}'
+        }
+        return results.style.format(format_dict)
+    else:
+        return results
+
+
+def _windowed_missing_table(obj, bins, clip_0=False, style=False):
+    """ Internal helper that builds the missing() table for every time window with one groupby
+
+    Args:
+        bins (Series): Start of the window of each row from _window_bins()
+        See missing() for the remaining arguments
+
+    Returns:
+        DataFrame (or Styler) indexed by the window and column name
+    """
+    grouped = obj.groupby(bins)
+    present = grouped.count()
+    total = grouped.size().to_numpy()
+    null_counts = total[:, np.newaxis] - present.to_numpy()
+    index = pd.MultiIndex.from_product([present.index, obj.columns],
+                                       names=[bins.name, None])
+    missing = pd.DataFrame({'missing': null_counts.ravel(),
+                            'total': np.repeat(total, len(obj.columns))},
+                           index=index)
+    missing['percent'] = missing['missing'] / missing['total'] * 100
+    if clip_0:
+        missing = missing[missing['missing'] > 0]
+
+    # Sort by the missing values inside each window
+    order = np.lexsort((-missing['missing'].to_numpy(),
+                        missing.index.codes[0]))
+    results = missing.iloc[order]
+    if style:
+        format_dict = {
+            'percent': '{:.2f}%',
+            'total': '{0:,.0f}',
+            'missing': '{0:,.0f}'
+        }
+        return results.style.format(format_dict)
+    else:
+        return results
+
+
+def _flat_labels(columns, positions, sep='_'):
+    """ Internal helper that joins the labels of the selected levels of a column MultiIndex.
+    Each unique value in a level is converted to a string once and looked up by its code
+
+    Args:
+        columns (MultiIndex): Column labels
+        positions (list):     Levels to join in order
+        sep (str):            Seperator for levels
+
+    Returns:
+        Index with one string label per column
+    """
+    parts = []
+    for position in positions:
+        # Code -1 is a missing value which takes the last entry
+        names = np.array([str(value) for value in columns.levels[position]] + ['nan'],
+                         dtype=object)
+        parts.append(names[columns.codes[position]])
+    return pd.Index([sep.join(names).rstrip(sep) for names in zip(*parts)], dtype=object)
+
+
+def _append_labels(index, labels):
+    """ Internal helper that adds subtotal and total labels to an index without changing it.
+    A categorical index keeps its dtype and has the labels added as categories
+
+    Args:
+        index (Index): Index or level of a MultiIndex
+        labels (list): Labels to add
+
+    Returns:
+        Index with the new labels at the end
+    """
+    labels = pd.Index(labels, dtype=object)
+    if isinstance(index, pd.CategoricalIndex):
+        new = labels[~labels.isin(index.categories)].unique()
+        dtype = pd.CategoricalDtype(index.categories.append(new), ordered=index.ordered)
+        return pd.CategoricalIndex(index.astype(object).append(labels), dtype=dtype,
+                                   name=index.name)
+    return index.append(labels)
+
+
+def _check_counts_args(include=None, exclude=None, sort_col='unique'):
+    """ Internal helper to validate the counts() arguments """
+    # Can only sort on columns that are numeric
+    valid_sort_cols = [
+        'index', 'count', 'unique', 'most_freq_count', 'least_freq_count'
+    ]
+    if sort_col not in valid_sort_cols:
+        msg = f"sort_col must be one of {valid_sort_cols}"
+        raise ValueError(msg)
+
+    # if all is passed to include, make sure no exclusions made too
+    if include == 'all' and exclude is not None:
+        msg = "exclude must be None when include is 'all'"
+        raise ValueError(msg)
+
+
+def _counts_table(results, index, sort_ascending=True, sort_col='unique', interval=False):
+    """ Internal helper that builds the counts() table from the summary of each column
+
+    Args:
+        results (list):  One tuple for each column. See _counts_summary
+        index (list):    Column names for each of the results
+        interval (bool): The results were estimated from a sample and include the bounds of
+                         the unique values. See _sampled_counts_summary
+        See counts() for the remaining arguments
+
+    Returns:
+        DataFrame with the counts table
+    """
+    # Descriptions for the resulting columns
+    col_labels = [
+        'count', 'unique', 'most_freq', 'most_freq_count', 'least_freq',
+        'least_freq_count'
+    ]
+    if interval:
+        col_labels += ['unique_low', 'unique_high']
+    result_df = pd.DataFrame.from_records(results,
+                                          index=index,
+                                          columns=col_labels)
+
+    # Return the DataFrame sorted by a specific column or the index
+    # By default we support sorting by column names but can handle an index sort
+    if sort_col != 'index':
+        return result_df.sort_values(by=[sort_col],
+                                     ascending=sort_ascending)
+    else:
+        return result_df.sort_index(ascending=sort_ascending)
 
 
 @pd.api.extensions.register_dataframe_accessor("stb")
@@ -15,25 +1141,30 @@ class SideTableAccessor:
     Computes a frequency table on one or more columns with df.stb.freq(['col_name'])
     Compute a table of missing values with df.stb.missing()
     """
-    SORT_FLAG = '~~~~zz'
-
     def __init__(self, pandas_obj):
         self._finalizer = weakref.finalize(self, self._cleanup)
         self._validate(pandas_obj)
         self._obj = pandas_obj
 
     def _cleanup(self):
+        forget(self._obj)
         del self._obj
 
     def remove(self):
         self._finalizer()
 
+    def cache_clear(self):
+        """ Remove the cached results for this DataFrame. See sidetable.enable_cache() """
+        forget(self._obj)
+
     @staticmethod
     def _validate(obj):
         # verify this is a DataFrame
         if not isinstance(obj, pd.DataFrame):
             raise AttributeError("Must be a pandas DataFrame")
 
+    @profiled
+    @cached
     def freq(self,
              cols,
              thresh=100,
@@ -42,7 +1173,16 @@ class SideTableAccessor:
              value=None,
              style=False,
              sort_cols=False,
-             cum_cols=True):
+             cum_cols=True,
+             approx=False,
+             approx_capacity=1000,
+             incremental=False,
+             window=None,
+             on=None,
+             weights=None,
+             sort_metric=None,
+             dropna=True,
+             na_label='missing'):
         """ Create a table that counts the frequency of occurrence or summation of values
         for one or more columns of data. Table is sorted and includes cumulative
         values which can be useful for identifying a cutoff.
@@ -60,153 +1200,224 @@ class SideTableAccessor:
             other_label (str): if cutoff is used, this text will be used in the dataframe results
             clip_0 (bool):     In cases where 0 counts are generated, remove them from the list
             value (str):       Column that will be summed. If provided, summation is done
-                               instead of counting each entry
+                               instead of counting each entry. A list of columns sums each
+                               of them in one groupby and adds percent_, cumulative_ and
+                               cumulative_percent_ columns for each one
             style (bool):      Apply a pandas style to format percentages
             sort_cols (bool):  By default False, will sort on numeric results.
                                If True, will sort based on column values.
             cum_cols (bool):   Default is True and will include Cumulative Count and Cumulative
                                Percent. Set to False and these columns will not be returned
+            approx (bool):     Default is False. If True, a Space-Saving sketch that only tracks
+                               approx_capacity groups is used so memory is bounded. The
+                               top groups are returned along with an others row and an
+                               error column with the maximum error in each estimate
+            approx_capacity (int): Number of groups tracked when approx is True
+            incremental (bool): Default is False. If True, an IncrementalFreq is returned
+                               instead of a table. Its append() method takes the rows added
+                               to the end of the DataFrame and returns the updated table
+                               without grouping the earlier rows again
+            window (str):      Fixed time frequency such as '1h' or '1D'. If provided, a table
+                               is built for each window with one groupby. The first column
+                               has the start of the window and the percents and cumulative
+                               values start over in each window
+            on (str):          Datetime column used for the windows. Default is the index
+            weights (str):     Column with a weight for each row. The count (or each value)
+                               is replaced by the weighted sum
+            sort_metric (str): Column of a value list used to sort the table and apply the
+                               threshold. Default is the first value
+            dropna (bool):     Default is True and rows with missing values in cols are left
+                               out. Set to False to count them as their own group in the
+                               same groupby
+            na_label (str):    Label used for the missing values when dropna is False. It
+                               can not already be a value in one of the cols
 
         Returns:
             Dataframe that summarizes the number of occurrences of each value in the provided
             columns or the sum of the data provided in the value parameter
         """
-        if not isinstance(cols, list):
-            raise AttributeError('Must pass a list of columns')
-
-        if isinstance(value, list):
-            raise AttributeError('value must be a string not a list')
-
-        if value and value not in self._obj.columns:
-            raise AttributeError('value must be a column name')
-
-        if value and not is_numeric_dtype(self._obj[value]):
-            raise AttributeError(f'{value} must be a numeric column')
-
-        if thresh > 100:
-            raise AttributeError('Thresh must be <= 100')
-
-        if thresh <= 1:
-            warnings.warn(
-                f'thresh should be expressed as a percentage. Did you mean {int(thresh*100)}?'
-            )
+        if not dropna and (approx or incremental or window is not None):
+            raise AttributeError('dropna=False can not be used with approx, incremental or window')
+
+        if isinstance(value, list) or weights is not None or sort_metric is not None:
+            if approx or incremental or window is not None:
+                raise AttributeError('approx, incremental and window can not be used with a '
+                                     'list of values or weights')
+            if sort_metric is not None and not isinstance(value, list):
+                raise AttributeError('sort_metric can only be used with a list of values')
+            metrics = _check_metric_args(self._obj, cols, value, weights, sort_metric, thresh)
+            with phase('group'):
+                group_data = _metric_group_data(self._obj,
+                                                cols,
+                                                value if isinstance(value, list) else
+                                                [value] if value else [],
+                                                weights,
+                                                dropna)
+            if not isinstance(value, list):
+                return _freq_table(group_data,
+                                   cols,
+                                   metrics[0],
+                                   thresh=thresh,
+                                   other_label=other_label,
+                                   clip_0=clip_0,
+                                   style=style,
+                                   sort_cols=sort_cols,
+                                   cum_cols=cum_cols,
+                                   na_label=None if dropna else na_label)
+            return _multi_freq_table(group_data,
+                                     cols,
+                                     metrics,
+                                     sort_metric if sort_metric else metrics[0],
+                                     thresh=thresh,
+                                     other_label=other_label,
+                                     clip_0=clip_0,
+                                     style=style,
+                                     sort_cols=sort_cols,
+                                     cum_cols=cum_cols,
+                                     na_label=None if dropna else na_label)
+
+        _check_freq_args(self._obj, cols, value, thresh)
+
+        if window is not None:
+            if approx or incremental:
+                raise AttributeError('window can not be used with approx or incremental')
+            return _windowed_freq_table(self._obj,
+                                        cols,
+                                        value,
+                                        _window_bins(self._obj, window, on),
+                                        thresh=thresh,
+                                        other_label=other_label,
+                                        clip_0=clip_0,
+                                        style=style,
+                                        sort_cols=sort_cols,
+                                        cum_cols=cum_cols)
+
+        if incremental:
+            if approx:
+                raise AttributeError('approx and incremental can not be used together')
+            from .stream import IncrementalFreq
+            return IncrementalFreq(cols,
+                                   thresh=thresh,
+                                   other_label=other_label,
+                                   clip_0=clip_0,
+                                   value=value,
+                                   style=style,
+                                   sort_cols=sort_cols,
+                                   cum_cols=cum_cols).update(self._obj)
 
         # Determine aggregation (counts or summation) for each item in column
 
-        # TODO: NaNs need to be handled better. Wait for pandas 1.1
-        # https://pandas.pydata.org/pandas-docs/dev/whatsnew/v1.1.0.html#allow-na-in-groupby-key
-        if value:
-            col_name = value
-            agg_func = {value: 'sum'}
-            group_data = self._obj.groupby(cols).agg(agg_func).reset_index()
-        else:
-            col_name = 'count'
-            group_data = self._obj.groupby(cols).size().reset_index(
-                name=col_name)
-
-        # Sort the results either by the grouped column(s) or numeric values
-        # cleanup the index
-        if sort_cols:
-            results = group_data.sort_values(
-                cols, ascending=True).reset_index(drop=True)
-        else:
-            results = group_data.sort_values(
-                [col_name] + cols, ascending=False).reset_index(drop=True)
-
-        # In data with null values, can include 0 counts filter them out by default
-        if clip_0:
-            results = results[results[col_name] > 0]
-
-        # Include percents
-        total = results[col_name].sum()
-        results['percent'] = (results[col_name] / total) * 100
-
-        # Keep track of cumulative counts or totals as well as their relative percent
-        results[f'cumulative_{col_name}'] = results[col_name].cumsum()
-        results['cumulative_percent'] = (results[f'cumulative_{col_name}'] /
-                                         total) * 100
-
-        # cutoff is a percentage below which all values are grouped together in an
-        # others category
-        if thresh < 100:
-            # Flag the All Other rows
-            results[other_label] = False
-            results.loc[results['cumulative_percent'] > thresh,
-                        other_label] = True
-
-            # Calculate the total amount and percentage of the others
-            other_total = results.loc[results[other_label], col_name].sum()
-            other_pct = (other_total / total) * 100
-
-            # Create the footer row to append to the results
-            all_others = pd.DataFrame({
-                col_name: [other_total],
-                'percent': [other_pct],
-                f'cumulative_{col_name}': [total],
-                'cumulative_percent': [100.0]
-            })
-            # Categorical columns can break the merge. Convert to strings
-            cat_cols = results.select_dtypes(['category']).columns
-            results[cat_cols] = results[cat_cols].apply(lambda x: x.astype(str))
-            # Add the footer row, remove the Others column and rename the placeholder
-            results = pd.concat(
-                [results[results[other_label] == False], all_others],
-                ignore_index=True).drop(columns=[other_label]).fillna(
-                    dict.fromkeys(cols, other_label))
-        if not cum_cols:
-            results = results.drop(
-                columns=['cumulative_percent', f'cumulative_{col_name}'])
-        if style:
-            format_dict = {
-                'percent': '{:.2f}%',
-                'cumulative_percent': '{:.2f}%',
-                'count': '{0:,.0f}',
-                f'{col_name}': '{0:,.0f}',
-                f'cumulative_{col_name}': '{0:,.0f}'
-            }
-            return results.style.format(format_dict)
-        else:
-            return results
-
-    def missing(self, clip_0=False, style=False):
+        if approx:
+            sketch = SpaceSaving(approx_capacity)
+            # Only one chunk of rows is grouped at a time so memory stays bounded
+            with phase('group'):
+                for start in range(0, len(self._obj), _APPROX_CHUNK_ROWS):
+                    chunk = self._obj.iloc[start:start + _APPROX_CHUNK_ROWS]
+                    if value:
+                        sketch.update(chunk.groupby(cols, observed=True)[value].sum())
+                    else:
+                        sketch.update(chunk.groupby(cols, observed=True).size())
+            return _approx_freq_table(sketch,
+                                      cols,
+                                      value if value else 'count',
+                                      thresh=thresh,
+                                      other_label=other_label,
+                                      clip_0=clip_0,
+                                      style=style,
+                                      sort_cols=sort_cols,
+                                      cum_cols=cum_cols)
+
+        col_name = value if value else 'count'
+        with phase('group'):
+            group_data = _freq_group_data(self._obj, cols, value, dropna=dropna)
+
+        return _freq_table(group_data,
+                           cols,
+                           col_name,
+                           thresh=thresh,
+                           other_label=other_label,
+                           clip_0=clip_0,
+                           style=style,
+                           sort_cols=sort_cols,
+                           cum_cols=cum_cols,
+                           na_label=None if dropna else na_label)
+
+    @profiled
+    @cached
+    def missing(self,
+                clip_0=False,
+                style=False,
+                n_jobs=1,
+                backend='threads',
+                sample=None,
+                random_state=None,
+                window=None,
+                on=None):
         """ Build table of missing data in each column.
 
             clip_0 (bool):     In cases where 0 counts are generated, remove them from the list
             style (bool):     Apply a pandas style to format percentages
+            n_jobs (int):      Number of workers used to process blocks of columns in parallel.
+                               Default is 1. Use -1 for all available cores
+            backend (str):     'threads' (default) or 'processes' when n_jobs is not 1
+            sample (float):    Estimate the table from a random sample of the rows. A fraction
+                               of the rows when a float up to 1.0, otherwise the number of rows.
+                               Adds percent_low and percent_high with the 95% confidence
+                               interval. Default is None to use every row
+            random_state (int): Seed used to draw the sample
+            window (str):      Fixed time frequency such as '1h' or '1D'. If provided, the
+                               table is indexed by the start of each window and the column
+            on (str):          Datetime column used for the windows. Default is the index
 
         Returns:
             DataFrame with each Column including total Missing Values, Percent Missing
             and Total rows
         """
-        missing = pd.concat(
-            [self._obj.isna().sum(),
-             self._obj.isna().mean().mul(100)],
-            axis='columns').rename(columns={
-                0: 'missing',
-                1: 'percent'
-            })
-        missing['total'] = len(self._obj)
-        if clip_0:
-            missing = missing[missing['missing'] > 0]
-
-        results = missing[['missing', 'total',
-                           'percent']].sort_values(by=['missing'],
-                                                   ascending=False)
-        if style:
-            format_dict = {
-                'percent': '{:.2f}%',
-                'total': '{0:,.0f}',
-                'missing': '{0:,.0f}'
-            }
-            return results.style.format(format_dict)
-        else:
-            return results
-
+        if window is not None:
+            if sample is not None:
+                raise AttributeError('window can not be used with sample')
+            return _windowed_missing_table(self._obj,
+                                           _window_bins(self._obj, window, on),
+                                           clip_0=clip_0,
+                                           style=style)
+
+        data = self._obj
+        if sample is not None:
+            with phase('sample'):
+                data = _sample_rows(self._obj, sample, random_state)
+        with phase('count_nulls'):
+            null_counts = pd.concat(
+                _map_column_blocks(data,
+                                   range(data.shape[1]),
+                                   _missing_block,
+                                   n_jobs=n_jobs,
+                                   backend=backend))
+        null_counts.index = self._obj.columns
+        if sample is None:
+            return _missing_table(null_counts, len(self._obj), clip_0=clip_0, style=style)
+
+        total = len(self._obj)
+        low, high = _wilson_interval(null_counts.to_numpy(), len(data), total)
+        estimate = (null_counts * (total / len(data))).round().astype('int64')
+        return _missing_table(estimate,
+                              total,
+                              clip_0=clip_0,
+                              style=style,
+                              interval=(low * 100, high * 100))
+
+    @profiled
+    @cached
     def counts(self,
                include=None,
                exclude=None,
                sort_ascending=True,
-               sort_col='unique'):
+               sort_col='unique',
+               n_jobs=1,
+               backend='threads',
+               sample=None,
+               random_state=None,
+               approx_unique=False,
+               approx_precision=14):
         """ Build a table of total and unique values in a column.
         Also include most and least frequent counts and items.
 
@@ -225,107 +1436,118 @@ class SideTableAccessor:
                                         as well as valid options for select_dtypes
             sort_ascending (bool, optional): Sort order. Defaults to True.
             sort_col (str, optional): Column (or index) to use for sorting. Defaults to 'unique'.
+            n_jobs (int, optional): Number of workers used to process blocks of columns in
+                                    parallel. Defaults to 1. Use -1 for all available cores.
+            backend (str, optional): 'threads' or 'processes'. Defaults to 'threads'.
+            sample (float, optional): Estimate the table from a random sample of the rows.
+                                      A fraction of the rows when a float up to 1.0,
+                                      otherwise the number of rows. The counts are scaled up to the full
+                                      data and unique_low and unique_high bound the number of
+                                      unique values. Defaults to None to use every row.
+            random_state (int, optional): Seed used to draw the sample. Defaults to None.
+            approx_unique (bool, optional): Estimate the unique values with a HyperLogLog
+                                            sketch and the most frequent value with a
+                                            Space-Saving sketch so memory stays bounded.
+                                            least_freq is left empty. Defaults to False.
+            approx_precision (int, optional): HyperLogLog precision from 4 to 18. The sketch
+                                              uses 2**approx_precision bytes and has a relative
+                                              error of about 1.04 / sqrt(2**approx_precision).
+                                              Defaults to 14.
 
         Raises:
             ValueError: If invalid sort_col requested
             ValueError: If exclude options not correct
+            ValueError: If n_jobs or backend are not valid
+            ValueError: If sample and approx_unique are both used
 
         Returns:
             DataFrame: Table with counts as well as unique values and most and least freq counts
         """
-        # Descriptions for the resulting columns
-        col_labels = [
-            'count', 'unique', 'most_freq', 'most_freq_count', 'least_freq',
-            'least_freq_count'
-        ]
-
-        # Can only sort on columns that are numeric
-        valid_sort_cols = [
-            'index', 'count', 'unique', 'most_freq_count', 'least_freq_count'
-        ]
-
-        # By default we support sorting by column names but can handle an index sort
-        sort_by_col = True
-        if sort_col not in valid_sort_cols:
-            msg = f"sort_col must be one of {valid_sort_cols}"
-            raise ValueError(msg)
-        if sort_col == 'index':
-            sort_by_col = False
-
-        # if all is passed to include, make sure no exclusions made too
-        # then assign all columns
-        if include == 'all':
-            if exclude is not None:
-                msg = "exclude must be None when include is 'all'"
-                raise ValueError(msg)
-            # Filter out columns that are completely null
-            cols_to_use = self._obj.columns[~self._obj.isna().all()]
+        _check_counts_args(include, exclude, sort_col)
+        if approx_unique and sample is not None:
+            raise ValueError('sample and approx_unique can not be used together')
+        data = self._obj
+        if sample is not None:
+            with phase('sample'):
+                data = _sample_rows(self._obj, sample, random_state)
 
         # Default is to include all columns
-        elif (include is None) and (exclude is None):
-            # Filter out completely null columns
-            cols_to_use = self._obj.columns[~self._obj.isna().all()]
-
-        # Pass the include and exclude values to select_dtypes
-        else:
-            cols_to_use = self._obj.select_dtypes(include=include,
-                                                  exclude=exclude).columns
+        with phase('select_columns'):
+            if include == 'all' or ((include is None) and (exclude is None)):
+                # Filter out completely null columns
+                has_values = [_null_count(data.iloc[:, i]) < len(data)
+                              for i in range(data.shape[1])]
+                positions = np.flatnonzero(np.array(has_values, dtype=bool))
+
+            # Pass the include and exclude values to select_dtypes
+            # An empty frame numbered by position keeps duplicate column names apart
+            else:
+                positions = (data.iloc[:0].set_axis(range(data.shape[1]), axis='columns')
+                             .select_dtypes(include=include, exclude=exclude).columns)
+            cols_to_use = data.columns[positions]
 
         # Calculate the results for all selected columns and build a DataFrame
-        results = [(self._obj[col].count(), self._obj[col].nunique(),
-                    self._obj[col].value_counts().idxmax(),
-                    self._obj[col].value_counts().max(),
-                    self._obj[col].value_counts().idxmin(),
-                    self._obj[col].value_counts().min())
-                   for col in cols_to_use]
-        result_df = pd.DataFrame.from_records(results,
-                                              index=cols_to_use,
-                                              columns=col_labels)
-
-        # Return the DataFrame sorted by a specific column or the index
-        if sort_by_col:
-            return result_df.sort_values(by=[sort_col],
-                                         ascending=sort_ascending)
-        else:
-            return result_df.sort_index(ascending=sort_ascending)
-
-    def _get_group_levels(self, level=1):
-        """Internal helper function to flatten out the group list from a multiindex
-
-        Args:
-            level (int, optional): [description]. Defaults to 1.
+        # Each column is only scanned once to tally all of its values
+        block_func = _counts_block
+        if approx_unique:
+            block_func = partial(_approx_counts_block, precision=approx_precision)
+        elif sample is not None:
+            block_func = partial(_sampled_counts_block, scale=len(self._obj) / len(data))
+        with phase('tally'):
+            blocks = _map_column_blocks(data,
+                                        positions,
+                                        block_func,
+                                        n_jobs=n_jobs,
+                                        backend=backend)
+            results = [row for block in blocks for row in block]
+        return _counts_table(results,
+                             cols_to_use,
+                             sort_ascending,
+                             sort_col,
+                             interval=sample is not None)
+
+    def lazy(self):
+        """ Start a plan of summaries that are computed together when collect() is called.
+        Columns are only factorized once and the missing value counts and group totals are
+        shared between the summaries.
+
+        Example:
+            freq_class, counts = df.stb.lazy().freq(['class']).counts().collect()
 
         Returns:
-            [type]: [description]
+            SideTablePlan with freq(), missing(), counts() and collect() methods
         """
-        list_items = [col[0:level] for col in self._obj.index]
-        results = []
-        for x in list_items:
-            if x not in results:
-                results += [x]
-        return results
+        # Imported here because the plan is built on the helpers in this module
+        from .lazy import SideTablePlan
+        return SideTablePlan(self._obj)
 
-    def _clean_labels(self, multi_index):
-        """ Remove flags on the subtotal labels that are used to enforce sorting. This
-        is an internal function
+    def _get_group_levels(self, level=1):
+        """Internal helper function to find the groups formed by the first levels of a
+        multiindex. Works on the integer codes of the index so it scales linearly.
 
         Args:
-            multi_index (pandas multi-index): Multi Index that includes the subtotal ordering
-                                              text
-        """
-        master_list = []
-        names = list(multi_index.names)
-        for index_item in multi_index:
-            sub_list = []
-            for level in index_item:
-                if level.startswith(self.SORT_FLAG):
-                    level_val = level[len(self.SORT_FLAG):]
-                else:
-                    level_val = level
-                sub_list.append(level_val)
-            master_list.append(tuple(sub_list))
-        return pd.MultiIndex.from_tuples(tuple(master_list), names=names)
+            level (int, optional): Number of index levels that form a group. Defaults to 1.
 
+        Returns:
+            Tuple with the group number of each row and a MultiIndex with the labels of each
+            group. Groups are numbered in the order they are first seen.
+        """
+        index = self._obj.index
+        group = np.zeros(len(index), dtype='int64')
+        for codes, labels in zip(index.codes[:level], index.levels[:level]):
+            # Missing labels have a code of -1 so shift everything up by one. Factorizing
+            # each step keeps the combined value small and numbers groups by first appearance
+            group, _ = pd.factorize(group * (len(labels) + 1) + codes + 1)
+        # The first row of each group is the first time its number is larger than all the
+        # numbers seen before it
+        previous_max = np.maximum.accumulate(np.concatenate([[-1], group[:-1]]))
+        first_rows = np.flatnonzero(group > previous_max)
+        group_labels = pd.MultiIndex(levels=index.levels[:level],
+                                     codes=[codes[first_rows] for codes in index.codes[:level]],
+                                     names=index.names[:level])
+        return group, group_labels
+
+    @profiled
     def subtotal(self,
                  sub_level=None,
                  grand_label='grand_total',
@@ -369,10 +1591,6 @@ class SideTableAccessor:
         # If this is not a multiindex, add the grand total to the DataFrame
         if all_levels == 1:
             # No subtotals since no groups
-            # Make sure the index is an object so we can append the subtotal without
-            # Getting into Categorical issues
-            self._obj.index = self._obj.index.astype('object')
-
             # Get list of all boolean columns
             # Recent version of pandas have deprecated automatic boolean
             # to numeric conversion. This preserves the previous behavior
@@ -384,13 +1602,17 @@ class SideTableAccessor:
 
             # If not multi-level, rename should not be a tuple
             # Add the Grand Total label at the end
-
-            return pd.concat([
+            results = pd.concat([
                 self._obj.astype(bool_col_convert),
                 self._obj.sum(numeric_only=True).rename(
                     grand_total_label[0]).to_frame().T
             ],
-                             axis='index')
+                                axis='index',
+                                ignore_index=True)
+            # The caller's index is left alone. The label is added to a new index that
+            # keeps the categories of a categorical index
+            results.index = _append_labels(self._obj.index, [grand_total_label[0]])
+            return results
 
         # Check that list is in the appropriate range
         if sub_calc_list[0] <= 0 or sub_calc_list[-1] > all_levels - 1:
@@ -400,33 +1622,107 @@ class SideTableAccessor:
                 error_msg = f'sub_level must be between 1 and {all_levels-1}.'
             raise AttributeError(error_msg)
 
-        # Remove any categorical indices
-        self._obj.index = pd.MultiIndex.from_tuples(
-            [n for i, n in enumerate(self._obj.index)],
-            names=list(self._obj.index.names))
-
-        subtotal_levels = []
+        frames = [self._obj]
+        # One array of labels for each index level. The subtotal rows are added after the
+        # original rows and then moved into place with a single sort
+        level_values = [[self._obj.index.get_level_values(level).to_numpy(dtype=object)]
+                        for level in range(all_levels)]
+        group_keys = []
         # Calculate the subtotal at each level given
-        for i in sub_calc_list:
-            level_result = self._calc_subtotal(sub_level=i,
-                                               sub_label=sub_label,
-                                               show_sep=show_sep,
-                                               sep=sep)
-            subtotal_levels.append(level_result)
-
-        # Use combine first to join all the individual levels together into a single
-        # DataFrame
-        results = reduce(lambda l, r: l.combine_first(r), subtotal_levels)
-
-        # Remove the subtotal sorting values
-        results.index = self._clean_labels(results.index)
+        with phase('subtotals'):
+            for i in sub_calc_list:
+                level_result, row_groups = self._calc_subtotal(sub_level=i,
+                                                               sub_label=sub_label,
+                                                               show_sep=show_sep,
+                                                               sep=sep)
+                frames.append(level_result)
+                group_keys.append((i, row_groups, len(level_result)))
+                for level in range(all_levels):
+                    level_values[level].append(
+                        level_result.index.get_level_values(level).to_numpy(dtype=object))
+            level_values = [np.concatenate(values) for values in level_values]
+
+        with phase('order'):
+            order = self._subtotal_order(level_values, group_keys)
+            results = pd.concat(frames, ignore_index=True).iloc[order]
+
         # Final step is to add Grand total
-        return pd.concat([
+        results = pd.concat([
             results,
             self._obj.sum(numeric_only=True).rename(
                 grand_total_label).to_frame().T
         ],
-                         axis='index')
+                            axis='index',
+                            ignore_index=True)
+
+        # The new index is built from the levels and codes of the caller's index so typed
+        # and categorical levels are kept and the caller's DataFrame is not changed
+        with phase('index'):
+            index = self._obj.index
+            num_rows = len(index)
+            order = np.append(order, len(order))
+            levels = []
+            codes = []
+            for level in range(all_levels):
+                labels = np.append(level_values[level][num_rows:],
+                                   np.array([grand_total_label[level]], dtype=object))
+                new = pd.Index(pd.unique(labels), dtype=object)
+                new = new[(index.levels[level].get_indexer(new) < 0) & new.notna()]
+                level_labels = _append_labels(index.levels[level], new)
+                level_codes = np.concatenate([index.codes[level],
+                                              level_labels.get_indexer(labels)])
+                levels.append(level_labels)
+                codes.append(level_codes[order])
+            results.index = pd.MultiIndex(levels=levels,
+                                          codes=codes,
+                                          names=list(index.names),
+                                          verify_integrity=False)
+        return results
+
+    def _subtotal_order(self, level_values, group_keys):
+        """ Internal helper function that finds the position of the original and subtotal rows
+
+            level_values (list):  Array of labels for each index level. The original rows are
+                                  first followed by the subtotal rows for each level
+            group_keys (list):    Tuple of (level, group number of each original row, number of
+                                  subtotal rows) for each subtotal level
+
+        Returns:
+            Array that puts the rows in their final order
+        """
+        num_rows = len(self._obj)
+        num_total = len(level_values[0])
+        position = np.arange(num_total)
+        if len(group_keys) == 1:
+            # A single level keeps the groups in the order they are first seen and
+            # places each subtotal after the rows in its group
+            _, row_groups, size = group_keys[0]
+            group = np.concatenate([row_groups, np.arange(size)])
+            is_subtotal = position >= num_rows
+            return np.lexsort((position, is_subtotal, group))
+
+        # Multiple levels are sorted by their labels. A subtotal sorts after all of the
+        # labels in its group
+        sort_keys = []
+        for level in range(len(level_values)):
+            labels = pd.Index(level_values[level][:num_rows]).unique()
+            try:
+                labels = labels.sort_values()
+            except TypeError:
+                labels = labels[np.argsort(labels.astype(str))]
+            keys = np.full(num_total, -1)
+            keys[:num_rows] = labels.get_indexer(level_values[level][:num_rows])
+            start = num_rows
+            for i, _, size in group_keys:
+                if level < i:
+                    keys[start:start + size] = labels.get_indexer(
+                        level_values[level][start:start + size])
+                elif level == i:
+                    keys[start:start + size] = len(labels)
+                start += size
+            sort_keys.append(keys)
+        # lexsort uses the last key as the primary key
+        return np.lexsort([position] + sort_keys[::-1])
 
     def _calc_subtotal(self,
                        sub_level=None,
@@ -442,47 +1738,53 @@ class SideTableAccessor:
             sep (str):             Seperator for levels, defaults to |
 
         Returns:
-            DataFrame Sub Total
+            DataFrame with one Sub Total row per group in the order the groups are first seen
+            and an array with the group number of each row in the DataFrame
         """
-
         all_levels = self._obj.index.nlevels
-        output = []
-        # Get the total for each cross section of the multi-index
-        for cross_section in self._get_group_levels(sub_level):
-            # Need to have blank spaces in label names so that all results will
-            # line up correctly
-            num_spaces = all_levels - len(cross_section)
-            if show_sep:
-                total_label = self.SORT_FLAG + sep.join(
-                    cross_section) + f' - {sub_label}'
-            else:
-                total_label = self.SORT_FLAG + f'{sub_label}'
-            sub_total_label = list(cross_section[0:sub_level]) + [
-                total_label
-            ] + [' '] * num_spaces
-            # Pull out the actual section and total it
-            section = self._obj.xs(cross_section, drop_level=False)
-            subtotal = section.sum(numeric_only=True).rename(
-                tuple(sub_total_label)).to_frame().T
-            output.append(pd.concat([section, subtotal]))
-        return pd.concat(output)
-
-    def flatten(self, reset=True, levels=None, sep='_'):
+        # Get the total for each group with one pass over the data
+        row_groups, group_labels = self._get_group_levels(sub_level)
+        subtotal = self._obj.groupby(row_groups).sum(numeric_only=True)
+        # A subtotal row has the same type that summing one section of the DataFrame would
+        subtotal = subtotal.astype(self._obj.iloc[:0].sum(numeric_only=True).dtype)
+        prefix = [
+            pd.Series(group_labels.get_level_values(level), dtype=object)
+            for level in range(sub_level)
+        ]
+        if show_sep:
+            total_label = prefix[0].astype(str).str.cat(
+                [values.astype(str) for values in prefix[1:]], sep=sep) + f' - {sub_label}'
+        else:
+            total_label = pd.Series(f'{sub_label}', index=prefix[0].index)
+        # Need to have blank spaces in label names so that all results will
+        # line up correctly
+        num_spaces = all_levels - sub_level - 1
+        subtotal.index = pd.MultiIndex.from_arrays(
+            prefix + [total_label] + [pd.Series(' ', index=prefix[0].index)] * num_spaces)
+        return subtotal, row_groups
+
+    @profiled
+    def flatten(self, reset=True, levels=None, sep='_', copy=True, inplace=False):
         """ Flatten multi-index column names into a single level of columns on a DataFrame
 
             reset (bool):       Should reset_index() be used before returning results
             levels (int, list): Indicate how many levels should be included in the column names
                                 Can also pass a list of column levels (0-indexed) [0,1,2]
             sep (str):          Seperator for levels, defaults to _
+            copy (bool):        Default is True to copy the data. If False, the result shares
+                                the data with the original DataFrame and only the column
+                                names are new
+            inplace (bool):     Default is False. If True, the columns of the DataFrame are
+                                replaced without copying the data and None is returned
 
             Returns:
-                DataFrame with flattened column levels
+                DataFrame with flattened column levels or None if inplace is True
         """
-        tmp = self._obj.copy()
+        if inplace:
+            tmp = self._obj
+        else:
+            tmp = self._obj.copy(deep=copy)
         valid_nlevels = tmp.columns.nlevels
-        if valid_nlevels == 0:
-            # Do nothing since there is no multiindex
-            return tmp
         if levels is None:
             # Default to the max depth
             levels = valid_nlevels
@@ -492,46 +1794,47 @@ class SideTableAccessor:
                 raise AttributeError(
                     f"Levels must be between 1 and {valid_nlevels}")
             else:
-                index = valid_nlevels - levels
-                col_vals = [col[index:valid_nlevels] for col in tmp.columns.values]
+                positions = list(range(valid_nlevels - levels, valid_nlevels))
         # Process a list or tuple of values
-        if type(levels) in [list, tuple]:
+        elif type(levels) in [list, tuple]:
             val_check = all([val in range(0, valid_nlevels) for val in levels])
             if not val_check:
                 raise AttributeError(f"Value out of {range(0, valid_nlevels-1)}")
             else:
-                if len(levels) > 1:
-                    col_vals = [itemgetter(*levels)(col) for col in tmp.columns.values]
-                else:
-                    # Only one value so get a single level only
-                    # Format this as a tuple so that the join doesn't break up the string
-                    col_vals = [(col[levels[0]],) for col in tmp.columns.values]
+                positions = list(levels)
+        else:
+            raise AttributeError('levels must be an integer or a list of levels')
         # Generate the column names and assign to the df
-        columns = [
-            sep.join(tuple(map(str, col))).rstrip(sep) for col in col_vals
-        ]
-        tmp.columns = columns
+        # Columns with a single level are already flat
+        if valid_nlevels > 1:
+            with phase('labels'):
+                tmp.columns = _flat_labels(tmp.columns, positions, sep)
         if reset:
-            return tmp.reset_index()
-        else:
+            with phase('reset_index'):
+                # In place so the data is not copied again
+                tmp.reset_index(inplace=True)
+        if not inplace:
             return tmp
 
-    def _pretty_col(self, col, precision, percent, pct_thresh):
+    def _pretty_col(self, max_val, precision, percent, pct_thresh):
+        """ Internal helper that finds the divisor and format string of a column from its
+        largest value so only the rows that are shown need to be divided
+        """
         # Code from https://github.com/azaitsev/millify
         millnames = ['', 'k', 'M', 'B', 'T', 'P', 'E', 'Z', 'Y']
-        max_val = col.astype('float').max(axis=0)
         magnitude = int(
             math.floor(0 if max_val == 0 else math.log10(abs(max_val)) / 3))
         millindex = max(0, min(len(millnames) - 1, magnitude))
-        values = col.div(10**(3 * millindex))
+        divisor = 10**(3 * millindex)
         format_letter = millnames[millindex]
         precision = f'.{precision}'
         if percent and max_val <= pct_thresh:
             format_string = "{:" + precision + "%}"
         else:
             format_string = '{:' + precision + 'f}' + f'{format_letter}'
-        return values, format_string
+        return divisor, format_string
 
+    @profiled
     def pretty(self,
                precision=2,
                percent=True,
@@ -557,39 +1860,41 @@ class SideTableAccessor:
         numeric_cols = self._obj.select_dtypes(include='number').columns
         # Allow the user to filter out numeric columns that should not be formatted
         exclude_list = exclude or []
-        other_cols = self._obj.select_dtypes(exclude='number')
         format_dict = {}
-        results = []
-        for col in numeric_cols:
-            if col not in exclude_list:
-                new_col, format_data = self._pretty_col(
-                    self._obj[col], precision, percent, pct_thresh)
-                format_dict[col] = format_data
-            else:
-                format_dict[col] = None
-                new_col = self._obj[col].values
-            results.append(pd.Series(new_col, name=col))
-        formatted_df = pd.concat(results, axis=1)
-        full_df = pd.concat([other_cols, formatted_df], axis=1)
-        # Truncate the number of rows
-        # Max sure the column order is preserved
+        divisors = {}
+        with phase('format'):
+            for col in numeric_cols:
+                if col not in exclude_list:
+                    # Only the largest value of the full column is needed
+                    max_val = float(self._obj[col].max())
+                    divisors[col], format_dict[col] = self._pretty_col(
+                        max_val, precision, percent, pct_thresh)
+                else:
+                    format_dict[col] = None
+
+        def shown(rows_df):
+            # Divide only the rows that are displayed
+            rows_df = rows_df.copy()
+            for col, divisor in divisors.items():
+                rows_df[col] = rows_df[col].div(divisor)
+            return rows_df
+
+        # Truncate the number of rows before formatting
         # Add a filler to indicate truncation
-        if isinstance(full_df.index, pd.MultiIndex):
-            filler = pd.DataFrame(columns=full_df.index.names,
-                                  index=[('--', ) * full_df.index.nlevels])
-        else:
-            filler = pd.DataFrame(columns=full_df.columns, index=['--'])
-            filler.loc['--'] = pd.NA
-        orig_col_order = self._obj.columns
-        if len(full_df.index) > rows:
-            short_table = pd.concat(
-                [full_df.head(int(rows / 2)), filler,
-                 full_df.tail(int(rows / 2))])
-            return_data = short_table[orig_col_order].style.format(format_dict,
-                                                                   na_rep=nan)
-        else:
-            return_data = full_df[orig_col_order].style.format(format_dict,
-                                                               na_rep=nan)
+        with phase('truncate'):
+            if len(self._obj.index) > rows:
+                if isinstance(self._obj.index, pd.MultiIndex):
+                    filler = pd.DataFrame(columns=self._obj.index.names,
+                                          index=[('--', ) * self._obj.index.nlevels])
+                else:
+                    filler = pd.DataFrame(columns=self._obj.columns, index=['--'])
+                    filler.loc['--'] = pd.NA
+                table = pd.concat([shown(self._obj.head(int(rows / 2))), filler,
+                                   shown(self._obj.tail(int(rows / 2)))])[self._obj.columns]
+            else:
+                table = shown(self._obj)
+        with phase('style'):
+            return_data = table.style.format(format_dict, na_rep=nan)
         if hide_index:
             return_data.hide(axis="index")
         if caption:
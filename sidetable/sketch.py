@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Fixed size sketches used by the approximate sidetable summaries"""
+
+import numpy as np
+import pandas as pd
+
+
+class SpaceSaving:
+    """Space-Saving heavy hitters sketch that keeps at most `capacity` items. Every tracked
+    item has an upper bound on its count and the maximum amount it may be over-estimated.
+    Items that are not tracked occurred at most `floor` times. Sketches can be merged so
+    each chunk or worker can build its own.
+
+    Example:
+        sketch = SpaceSaving(capacity=100)
+        sketch.update(chunk['url'].value_counts())
+        sketch.top()
+    """
+    def __init__(self, capacity=1000):
+        if not isinstance(capacity, int) or capacity < 1:
+            raise AttributeError('capacity must be a positive integer')
+        self.capacity = capacity
+        self.counts = None
+        self.errors = None
+        self.floor = 0
+        self.total = 0
+
+    def _combine(self, counts, errors, floor, total):
+        if (counts < 0).any():
+            raise AttributeError('Space-Saving can only count non-negative values')
+        if self.counts is None:
+            new_counts = counts
+            new_errors = errors
+        else:
+            keys = self.counts.index.append(counts.index.difference(self.counts.index,
+                                                                    sort=False))
+            # Anything one side does not track occurred at most floor times on that side
+            new_counts = (self.counts.reindex(keys, fill_value=self.floor) +
+                          counts.reindex(keys, fill_value=floor))
+            new_errors = (self.errors.reindex(keys, fill_value=self.floor) +
+                          errors.reindex(keys, fill_value=floor))
+        new_floor = self.floor + floor
+        if len(new_counts) > self.capacity:
+            # Only keep the largest items. Anything dropped is at most as large as the
+            # largest dropped count
+            ranked = new_counts.sort_values(ascending=False, kind='mergesort')
+            new_floor = max(new_floor, ranked.iloc[self.capacity])
+            keep = ranked.index[:self.capacity]
+            new_counts = ranked.iloc[:self.capacity]
+            new_errors = new_errors[keep]
+        self.counts = new_counts
+        self.errors = new_errors
+        self.floor = new_floor
+        self.total += total
+
+    def update(self, tally):
+        """ Add the exact counts (or sums) of a batch of data to the sketch
+
+        Args:
+            tally (Series): Count for each item in the batch. For example the result
+                            of value_counts() or groupby().size() on a chunk
+
+        Returns:
+            The sketch
+        """
+        tally = tally[tally != 0]
+        self._combine(tally, pd.Series(0, index=tally.index, dtype=tally.dtype), 0,
+                      tally.sum())
+        return self
+
+    def merge(self, other):
+        """ Add the items from another SpaceSaving sketch to this one. Returns the sketch """
+        if not isinstance(other, SpaceSaving):
+            raise AttributeError('Can only merge with another SpaceSaving sketch')
+        if other.counts is not None:
+            self._combine(other.counts, other.errors, other.floor, other.total)
+        return self
+
+    def top(self):
+        """ Return the tracked items as a DataFrame with the count upper bound and the maximum
+        error for each item. The items are sorted from most to least frequent.
+        """
+        if self.counts is None:
+            return pd.DataFrame({'count': [], 'error': []})
+        return pd.DataFrame({
+            'count': self.counts,
+            'error': self.errors
+        }).sort_values('count', ascending=False, kind='mergesort')
+
+
+def _bit_length(values):
+    """ Internal helper with the number of bits needed for each unsigned 64 bit integer """
+    # Each 32 bit half is exact as a float and frexp returns its bit length as the exponent
+    high = np.frexp((values >> np.uint64(32)).astype(np.float64))[1]
+    low = np.frexp((values & np.uint64(0xFFFFFFFF)).astype(np.float64))[1]
+    return np.where(high > 0, high + 32, low)
+
+
+class HyperLogLog:
+    """HyperLogLog sketch that estimates the number of distinct values with 2**precision
+    bytes of memory. The relative standard error is about 1.04 / sqrt(2**precision), 0.8% for
+    the default precision of 14. Sketches built on separate chunks or processes can be merged.
+
+    Example:
+        sketch = HyperLogLog(precision=12)
+        sketch.update(chunk['user_id'])
+        sketch.merge(other_sketch).estimate()
+    """
+    def __init__(self, precision=14):
+        if not isinstance(precision, int) or not 4 <= precision <= 18:
+            raise AttributeError('precision must be an integer from 4 to 18')
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values):
+        """ Add the values in a Series to the sketch. Missing values are ignored
+
+        Args:
+            values (Series): Values to add
+
+        Returns:
+            The sketch
+        """
+        values = values[values.notna()]
+        return self.update_hashes(pd.util.hash_pandas_object(values, index=False).to_numpy())
+
+    def update_hashes(self, hashes):
+        """ Add values that were already hashed to 64 bit unsigned integers, for example with
+        pd.util.hash_pandas_object(). Returns the sketch
+        """
+        if len(hashes) == 0:
+            return self
+        suffix_bits = 64 - self.precision
+        buckets = (hashes >> np.uint64(suffix_bits)).astype(np.intp)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        # Position of the first 1 bit in the suffix
+        ranks = (suffix_bits + 1 - _bit_length(suffix)).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+        return self
+
+    def merge(self, other):
+        """ Add the values from another HyperLogLog sketch to this one. Returns the sketch """
+        if not isinstance(other, HyperLogLog) or other.precision != self.precision:
+            raise AttributeError('Can only merge with a HyperLogLog of the same precision')
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        """ Return the estimated number of distinct values """
+        num_registers = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / num_registers)
+        raw = alpha * num_registers**2 / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        empty = int((self.registers == 0).sum())
+        if raw <= 2.5 * num_registers and empty > 0:
+            # Linear counting is more accurate for a small number of values
+            return int(round(num_registers * np.log(num_registers / empty)))
+        return int(round(raw))
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""Build sidetable summaries from data that is too large to fit in memory"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from .sidetable import (_check_thresh, _freq_table, _missing_block, _missing_table,
+                        _check_counts_args, _counts_summary, _counts_table, _value_tally)
+
+
+def _group_totals(chunk, cols, value=None):
+    """ Internal helper to count or sum the groups in one chunk of data
+
+    Args:
+        chunk (DataFrame): Chunk of the data
+        cols (list):       Column names that will be grouped together
+        value (str):       Column that will be summed instead of counting the rows
+
+    Returns:
+        Series with the count or sum for each group in the chunk
+    """
+    if not isinstance(chunk, pd.DataFrame):
+        raise AttributeError('Each chunk must be a pandas DataFrame')
+    if value:
+        if value not in chunk.columns:
+            raise AttributeError('value must be a column name')
+        if not is_numeric_dtype(chunk[value]):
+            raise AttributeError(f'{value} must be a numeric column')
+        return chunk.groupby(cols, observed=False)[value].sum()
+    return chunk.groupby(cols, observed=False).size()
+
+
+def _combine_totals(left, right):
+    """ Internal helper that adds the group totals from two chunks together. Groups that are
+    already in left are looked up by position instead of aligning both indexes and new groups
+    are added at the end. left is copied so a state that was merged in is never changed, which
+    means the work still grows with the total number of groups.
+    """
+    if left is None:
+        return right
+    positions = left.index.get_indexer(right.index)
+    found = positions >= 0
+    values = left.to_numpy(dtype=np.result_type(left.dtype, right.dtype), copy=True)
+    values[positions[found]] += right.to_numpy()[found]
+    totals = pd.Series(values, index=left.index, name=left.name)
+    if found.all():
+        return totals
+    return pd.concat([totals, right[~found].astype(values.dtype)])
+
+
+def _combine_tallies(left, right):
+    """ Internal helper that adds two value tallies together. Values keep the order in which
+    they were first seen so ties are broken the same way as on the full data.
+    """
+    if left is None:
+        return right
+    return pd.concat([left, right]).groupby(level=0, sort=False, observed=True).sum()
+
+
+def _check_state(state, other):
+    """ Internal helper to make sure two partial states can be merged """
+    if type(state) is not type(other):
+        raise AttributeError(f'Can only merge with another {type(state).__name__}')
+    if state._params() != other._params():
+        raise AttributeError('Can only merge states that were created with the same arguments')
+
+
+class FreqState:
+    """Partial group counts (or sums) that can be built up one chunk at a time and merged with
+    the state from other workers. finalize() returns the same table as df.stb.freq()
+
+    Example:
+        state = FreqState(['class'])
+        for chunk in chunks:
+            state.update(chunk)
+        state.merge(other_state).finalize(thresh=80)
+    """
+    def __init__(self, cols, value=None):
+        """
+        Args:
+            cols (list): dataframe column names that will be grouped together
+            value (str): Column that will be summed. If provided, summation is done
+                         instead of counting each entry
+        """
+        if not isinstance(cols, list):
+            raise AttributeError('Must pass a list of columns')
+
+        if isinstance(value, list):
+            raise AttributeError('value must be a string not a list')
+
+        self.cols = cols
+        self.value = value
+        self.totals = None
+
+    def _params(self):
+        return (self.cols, self.value)
+
+    def update(self, df):
+        """ Add the groups in a DataFrame to the state. Returns the state """
+        self.totals = _combine_totals(self.totals, _group_totals(df, self.cols, self.value))
+        return self
+
+    def merge(self, other):
+        """ Add the totals from another FreqState to this one. Returns the state """
+        _check_state(self, other)
+        if other.totals is not None:
+            self.totals = _combine_totals(self.totals, other.totals)
+        return self
+
+    def finalize(self,
+                 thresh=100,
+                 other_label='others',
+                 clip_0=True,
+                 style=False,
+                 sort_cols=False,
+                 cum_cols=True):
+        """ Build the frequency table. See df.stb.freq() for the arguments """
+        _check_thresh(thresh)
+        if self.totals is None:
+            raise AttributeError('No data has been added to the state')
+
+        col_name = self.value if self.value else 'count'
+        group_data = self.totals.rename(col_name).reset_index()
+        return _freq_table(group_data,
+                           self.cols,
+                           col_name,
+                           thresh=thresh,
+                           other_label=other_label,
+                           clip_0=clip_0,
+                           style=style,
+                           sort_cols=sort_cols,
+                           cum_cols=cum_cols)
+
+
+class IncrementalFreq(FreqState):
+    """Frequency table of a DataFrame that only grows at the end. The group totals are kept
+    between calls so append() only groups the new rows and updates the groups they contain.
+    Create one with df.stb.freq(..., incremental=True)
+
+    Example:
+        status = df.stb.freq(['status'], incremental=True)
+        status.table()
+        status.append(new_rows)
+    """
+    def __init__(self,
+                 cols,
+                 thresh=100,
+                 other_label='others',
+                 clip_0=True,
+                 value=None,
+                 style=False,
+                 sort_cols=False,
+                 cum_cols=True):
+        """
+        Args:
+            cols (list): dataframe column names that will be grouped together
+            See df.stb.freq() for the remaining arguments
+        """
+        super().__init__(cols, value=value)
+        _check_thresh(thresh)
+        self.rows = 0
+        self._table_args = dict(thresh=thresh,
+                                other_label=other_label,
+                                clip_0=clip_0,
+                                style=style,
+                                sort_cols=sort_cols,
+                                cum_cols=cum_cols)
+
+    def update(self, df):
+        """ Add the groups in a DataFrame to the totals. Returns the state """
+        super().update(df)
+        self.rows += len(df)
+        return self
+
+    def merge(self, other):
+        """ Add the totals from another IncrementalFreq to this one. Returns the state """
+        super().merge(other)
+        self.rows += other.rows
+        return self
+
+    def append(self, new_rows):
+        """ Add rows that were appended to the DataFrame and return the updated table
+
+        Args:
+            new_rows (DataFrame): Only the rows that were added since the last update
+
+        Returns:
+            The freq() table for all of the rows seen so far
+        """
+        return self.update(new_rows).table()
+
+    def table(self):
+        """ Return the freq() table for all of the rows seen so far """
+        return self.finalize(**self._table_args)
+
+
+class MissingState:
+    """Partial count of the missing values in each column. finalize() returns the same table
+    as df.stb.missing()
+    """
+    def __init__(self):
+        self.null_counts = None
+        self.rows = 0
+
+    def _params(self):
+        return ()
+
+    def _add(self, null_counts, rows):
+        if self.null_counts is None:
+            self.null_counts = null_counts
+        else:
+            # Keep the column order from the first chunk and add any new columns at the end
+            columns = self.null_counts.index.append(
+                null_counts.index.difference(self.null_counts.index, sort=False))
+            self.null_counts = (self.null_counts.reindex(columns, fill_value=0) +
+                                null_counts.reindex(columns, fill_value=0))
+        self.rows += rows
+
+    def update(self, df):
+        """ Add the missing values in a DataFrame to the state. Returns the state """
+        null_counts = _missing_block(df, range(df.shape[1]))
+        null_counts.index = df.columns
+        self._add(null_counts, len(df))
+        return self
+
+    def merge(self, other):
+        """ Add the counts from another MissingState to this one. Returns the state """
+        _check_state(self, other)
+        if other.null_counts is not None:
+            self._add(other.null_counts, other.rows)
+        return self
+
+    def finalize(self, clip_0=False, style=False):
+        """ Build the missing table. See df.stb.missing() for the arguments """
+        if self.null_counts is None:
+            raise AttributeError('No data has been added to the state')
+        return _missing_table(self.null_counts, self.rows, clip_0=clip_0, style=style)
+
+
+class CountsState:
+    """Partial tally of every value in each column. finalize() returns the same table
+    as df.stb.counts()
+    """
+    def __init__(self, include=None, exclude=None):
+        """
+        Args:
+            include ([type], optional): List of types to include. Defaults to None.
+            exclude ([type], optional): List of types to exclude. Defaults to None.
+        """
+        _check_counts_args(include, exclude)
+        self.include = include
+        self.exclude = exclude
+        self.tallies = {}
+
+    def _params(self):
+        return (self.include, self.exclude)
+
+    def _add(self, tallies):
+        for col, tally in tallies.items():
+            self.tallies[col] = _combine_tallies(self.tallies.get(col), tally)
+
+    def update(self, df):
+        """ Add the values in a DataFrame to the state. Returns the state """
+        if self.include == 'all' or ((self.include is None) and (self.exclude is None)):
+            cols_to_use = df.columns
+        else:
+            cols_to_use = df.select_dtypes(include=self.include, exclude=self.exclude).columns
+        self._add({col: _value_tally(df[col]) for col in cols_to_use})
+        return self
+
+    def merge(self, other):
+        """ Add the tallies from another CountsState to this one. Returns the state """
+        _check_state(self, other)
+        self._add(other.tallies)
+        return self
+
+    def finalize(self, sort_ascending=True, sort_col='unique'):
+        """ Build the counts table. See df.stb.counts() for the arguments """
+        _check_counts_args(self.include, self.exclude, sort_col)
+        cols_to_use = list(self.tallies)
+        if self.include == 'all' or ((self.include is None) and (self.exclude is None)):
+            # Filter out completely null columns
+            cols_to_use = [col for col in cols_to_use if self.tallies[col].sum() > 0]
+        results = [_counts_summary(self.tallies[col]) for col in cols_to_use]
+        return _counts_table(results, pd.Index(cols_to_use), sort_ascending, sort_col)
+
+
+def freq_stream(chunks,
+                cols,
+                thresh=100,
+                other_label='others',
+                clip_0=True,
+                value=None,
+                style=False,
+                sort_cols=False,
+                cum_cols=True):
+    """ Create the same table as df.stb.freq() from an iterable of DataFrames. Only the
+    group totals are kept between chunks so the full data never needs to be in memory.
+
+    Example:
+        chunks = pd.read_csv('events.csv', chunksize=1_000_000)
+        sidetable.freq_stream(chunks, ['status'])
+
+    Args:
+        chunks (iterable): DataFrames with the same columns. For example the result of
+                           pd.read_csv(..., chunksize=) or one DataFrame per parquet row group
+        cols (list):       dataframe column names that will be grouped together
+        See df.stb.freq() for the remaining arguments
+
+    Returns:
+        Dataframe that summarizes the number of occurrences of each value in the provided
+        columns or the sum of the data provided in the value parameter
+    """
+    if not isinstance(cols, list):
+        raise AttributeError('Must pass a list of columns')
+
+    if isinstance(value, list):
+        raise AttributeError('value must be a string not a list')
+
+    _check_thresh(thresh)
+
+    state = FreqState(cols, value=value)
+    for chunk in chunks:
+        state.update(chunk)
+
+    if state.totals is None:
+        raise AttributeError('chunks must contain at least one DataFrame')
+
+    return state.finalize(thresh=thresh,
+                          other_label=other_label,
+                          clip_0=clip_0,
+                          style=style,
+                          sort_cols=sort_cols,
+                          cum_cols=cum_cols)
@@ -3,8 +3,13 @@
 
 import pytest
 from sidetable import sidetable
+from sidetable import freq_stream, FreqState, MissingState, CountsState
+import sidetable as sidetable_pkg
 import pandas as pd
+import numpy as np
 import warnings
+import pickle
+import tracemalloc
 
 
 @pytest.fixture
@@ -173,6 +178,25 @@ def test_flatten(titanic):
     ]
 
 
+def test_flatten_copy(titanic):
+    """flatten should only copy the data when asked to
+    """
+    fares = titanic.groupby(['embark_town', 'class', 'sex']).agg({
+        'fare': ['sum', 'mean']
+    }).unstack()
+    expected = fares.stb.flatten(reset=False)
+
+    shared = fares.stb.flatten(reset=False, copy=False)
+    pd.testing.assert_frame_equal(shared, expected)
+    assert np.shares_memory(shared.iloc[:, 0].to_numpy(), fares.iloc[:, 0].to_numpy())
+    assert fares.columns.nlevels == 3
+
+    assert fares.stb.flatten(inplace=True) is None
+    pd.testing.assert_frame_equal(fares, expected.reset_index())
+
+    assert list(titanic[['age', 'fare']].stb.flatten(reset=False).columns) == ['age', 'fare']
+
+
 def test_pretty(titanic):
     """ Test the pretty print"""
     summary = titanic.groupby(['pclass', 'sex']).agg({'fare': 'sum'}).stb.pretty()
@@ -185,3 +209,462 @@ def test_pretty(titanic):
     assert isinstance(summary, pd.io.formats.style.Styler)
     result_str = '  fare\npclass sex \n1 female 10.0k\nmale 8.2k\n-- -- --\n3 female 2.3k\nmale 4.4k\n'
     assert summary.to_string() == result_str
+
+
+def test_pretty_visible_rows(titanic):
+    """ pretty should only build the Styler over the displayed rows"""
+    summary = titanic[['fare', 'age', 'survived', 'sex']].stb.pretty(rows=10, exclude=['age'])
+    assert len(summary.data) == 11
+    assert summary.data.index[5] == '--'
+    # The format is picked from the full column
+    assert summary.data['fare'].iloc[0] == titanic['fare'].iloc[0]
+    assert summary.data['age'].iloc[-5:].equals(titanic['age'].iloc[-5:])
+    assert summary.data.columns.tolist() == ['fare', 'age', 'survived', 'sex']
+
+
+def test_counts_matches_value_counts(titanic):
+    """counts should agree with the value_counts based calculations
+    """
+    table = titanic.stb.counts()
+    for col in table.index:
+        vc = titanic[col].value_counts()
+        assert table.loc[col, 'count'] == titanic[col].count()
+        assert table.loc[col, 'unique'] == titanic[col].nunique()
+        assert table.loc[col, 'most_freq'] == vc.idxmax()
+        assert table.loc[col, 'most_freq_count'] == vc.max()
+        assert table.loc[col, 'least_freq'] == vc.idxmin()
+        assert table.loc[col, 'least_freq_count'] == vc.min()
+
+
+def test_parallel(titanic):
+    """Parallel execution should return the same tables as the serial version
+    """
+    pd.testing.assert_frame_equal(titanic.stb.counts(),
+                                  titanic.stb.counts(n_jobs=4))
+    pd.testing.assert_frame_equal(titanic.stb.missing(),
+                                  titanic.stb.missing(n_jobs=4))
+    pd.testing.assert_frame_equal(
+        titanic.stb.missing(),
+        titanic.stb.missing(n_jobs=2, backend='processes'))
+    with pytest.raises(ValueError):
+        titanic.stb.counts(n_jobs=2, backend='gpu')
+
+
+def test_duplicate_columns():
+    """Columns with the same name should each get their own row
+    """
+    df = pd.DataFrame([[1, np.nan, 3], [np.nan, 2, 3]], columns=['a', 'a', 'b'])
+    missing = df.stb.missing()
+    assert len(missing) == 3
+    assert missing['missing'].sum() == 2
+    pd.testing.assert_frame_equal(missing, df.stb.missing(n_jobs=2, backend='processes'))
+    counts = df.stb.counts()
+    assert list(counts.index).count('a') == 2
+    pd.testing.assert_frame_equal(counts, df.stb.counts(n_jobs=2))
+    assert len(df.stb.counts(include='number')) == 3
+    lazy_missing, lazy_counts = df.stb.lazy().missing().counts().collect()
+    pd.testing.assert_frame_equal(lazy_missing, missing)
+    pd.testing.assert_frame_equal(lazy_counts, counts)
+
+
+def test_freq_stream(titanic):
+    """Frequency tables built from chunks should match the in memory version
+    """
+    chunks = [titanic.iloc[i:i + 100] for i in range(0, len(titanic), 100)]
+    pd.testing.assert_frame_equal(freq_stream(chunks, ['sex', 'class']),
+                                  titanic.stb.freq(['sex', 'class']))
+    chunks = (titanic.iloc[i:i + 100] for i in range(0, len(titanic), 100))
+    pd.testing.assert_frame_equal(
+        freq_stream(chunks, ['embark_town', 'class'], value='fare', thresh=90),
+        titanic.stb.freq(['embark_town', 'class'], value='fare', thresh=90))
+    with pytest.raises(AttributeError):
+        freq_stream([], ['sex'])
+
+
+def test_partial_states(titanic):
+    """Merged partial states should match the results on the full DataFrame
+    """
+    top, bottom = titanic.iloc[:400], titanic.iloc[400:]
+
+    state = FreqState(['sex', 'class']).update(top)
+    other = pickle.loads(pickle.dumps(FreqState(['sex', 'class']).update(bottom)))
+    pd.testing.assert_frame_equal(state.merge(other).finalize(thresh=90),
+                                  titanic.stb.freq(['sex', 'class'], thresh=90))
+
+    state = MissingState().update(top)
+    other = pickle.loads(pickle.dumps(MissingState().update(bottom)))
+    pd.testing.assert_frame_equal(state.merge(other).finalize(), titanic.stb.missing())
+
+    state = CountsState().update(top)
+    other = pickle.loads(pickle.dumps(CountsState().update(bottom)))
+    pd.testing.assert_frame_equal(state.merge(other).finalize(), titanic.stb.counts())
+
+    with pytest.raises(AttributeError):
+        FreqState(['sex']).merge(FreqState(['class']))
+
+
+def test_freq_incremental(titanic):
+    """Appending rows should give the same table as freq() on all of the rows
+    """
+    incremental = titanic.iloc[:300].stb.freq(['sex', 'class'], value='fare', thresh=90,
+                                              incremental=True)
+    incremental.append(titanic.iloc[300:600])
+    pd.testing.assert_frame_equal(incremental.append(titanic.iloc[600:]),
+                                  titanic.stb.freq(['sex', 'class'], value='fare', thresh=90))
+    assert incremental.rows == len(titanic)
+
+    with pytest.raises(AttributeError):
+        titanic.stb.freq(['sex'], incremental=True, approx=True)
+
+
+def test_window(titanic):
+    """Each window should match the table built from its own rows
+    """
+    titanic['boarded'] = pd.Timestamp('1912-04-10') + pd.to_timedelta(titanic.index, unit='min')
+    hours = titanic['boarded'].dt.floor('1h')
+
+    results = titanic.stb.freq(['class'], thresh=80, window='1h', on='boarded')
+    expected = titanic[hours == hours.iloc[-1]].stb.freq(['class'], thresh=80)
+    last = results[results['boarded'] == hours.iloc[-1]].drop(columns='boarded')
+    pd.testing.assert_frame_equal(last.reset_index(drop=True), expected.reset_index(drop=True))
+    assert results['boarded'].nunique() == hours.nunique()
+
+    missing = titanic.set_index('boarded').stb.missing(window='1h', clip_0=True)
+    pd.testing.assert_frame_equal(missing.loc[hours.iloc[0]],
+                                  titanic[hours == hours.iloc[0]].stb.missing(clip_0=True))
+
+    with pytest.raises(AttributeError):
+        titanic.stb.freq(['class'], window='1h')
+
+
+def test_freq_value_list(titanic):
+    """A list of values should match calling freq() for each value
+    """
+    results = titanic.stb.freq(['class', 'who'], value=['survived', 'fare'],
+                               sort_metric='fare', thresh=80)
+    expected = titanic.stb.freq(['class', 'who'], value='fare', thresh=80)
+    np.testing.assert_allclose(results['percent_fare'], expected['percent'])
+    assert list(results['who']) == list(expected['who'])
+    assert results['survived'].sum() == titanic['survived'].sum()
+
+    weighted = titanic.stb.freq(['class'], weights='fare')
+    pd.testing.assert_frame_equal(
+        weighted.rename(columns={'count': 'fare', 'cumulative_count': 'cumulative_fare'}),
+        titanic.stb.freq(['class'], value='fare'))
+
+    with pytest.raises(AttributeError):
+        titanic.stb.freq(['class'], value=['fare'], sort_metric='age')
+
+
+def test_freq_dropna(titanic):
+    """Missing values should be their own group when dropna is False
+    """
+    results = titanic.stb.freq(['deck'], dropna=False, na_label='Unknown')
+    assert results.iloc[0]['deck'] == 'Unknown'
+    assert results.iloc[0]['count'] == titanic['deck'].isna().sum()
+    assert results['count'].sum() == len(titanic)
+
+    results = titanic.stb.freq(['embark_town', 'deck'], value='fare', dropna=False, thresh=90)
+    assert (results['embark_town'] == 'missing').sum() == 0
+    assert results.iloc[0]['deck'] == 'missing'
+    assert results['fare'].sum() == pytest.approx(titanic['fare'].sum())
+
+    with pytest.raises(AttributeError):
+        titanic.stb.freq(['embark_town'], dropna=False, na_label='Cherbourg')
+    with pytest.raises(AttributeError):
+        titanic.stb.freq(['embark_town'], value=['fare'], dropna=False, na_label='Cherbourg')
+    # A label that only matches a column without missing values is fine
+    results = titanic.stb.freq(['sex', 'embark_town'], dropna=False, na_label='male')
+    assert results['count'].sum() == len(titanic)
+
+
+def test_profile(titanic):
+    """Each phase should be reported and nothing after profiling stops
+    """
+    with sidetable_pkg.profile(memory=True) as timings:
+        titanic.stb.freq(['class', 'who'], thresh=80, style=True)
+    phases = [(timing.method, timing.phase) for timing in timings]
+    assert phases == [('freq', 'group'), ('freq', 'sort'), ('freq', 'thresh'),
+                      ('freq', 'style'), ('freq', 'total')]
+    assert all(timing.seconds >= 0 and timing.peak_bytes >= 0 for timing in timings)
+
+    titanic.stb.missing()
+    assert len(timings) == 5
+
+    calls = []
+    sidetable_pkg.set_profiler(calls.append)
+    try:
+        titanic.stb.counts()
+    finally:
+        sidetable_pkg.set_profiler(None)
+    assert calls[-1].method == 'counts' and calls[-1].peak_bytes is None
+
+
+def test_subtotal_unchanged(titanic):
+    """subtotal should leave the caller's index alone and keep categorical levels
+    """
+    table = titanic.groupby(['sex', 'class'], observed=True).agg({'fare': 'sum'})
+    index = table.index.copy()
+    results = table.stb.subtotal()
+    assert table.index.equals(index)
+    assert isinstance(table.index.levels[1].dtype, pd.CategoricalDtype)
+    assert isinstance(results.index.levels[1].dtype, pd.CategoricalDtype)
+    assert results.index.names == ['sex', 'class']
+    assert results.loc[('female', 'female - subtotal'), 'fare'] == pytest.approx(
+        table.loc['female', 'fare'].sum())
+
+    by_class = titanic.groupby('class', observed=True).agg({'fare': 'sum'})
+    results = by_class.stb.subtotal()
+    assert isinstance(by_class.index.dtype, pd.CategoricalDtype)
+    assert 'grand_total' in results.index.categories
+
+
+def test_subtotal_order(titanic):
+    """Subtotals should follow the rows in their group
+    """
+    table = titanic.groupby(['sex', 'class']).agg({'fare': 'sum'})
+    results = table.stb.subtotal()
+    labels = list(results.index.get_level_values(1))
+    assert labels[3] == 'female - subtotal'
+    assert labels[7] == 'male - subtotal'
+    assert results.iloc[3, 0] == pytest.approx(table.loc['female', 'fare'].sum())
+    assert results.iloc[-1, 0] == pytest.approx(table['fare'].sum())
+
+    table = titanic.groupby(['sex', 'embark_town', 'class']).agg({'fare': 'sum'})
+    results = table.stb.subtotal(sub_level=[1, 2], show_sep=False)
+    female = results.loc['female']
+    assert female.index[-1] == ('subtotal', ' ')
+    assert female.index[3] == ('Cherbourg', 'subtotal')
+    assert female.iloc[3, 0] == pytest.approx(table.loc[('female', 'Cherbourg'), 'fare'].sum())
+
+
+def test_group_levels(titanic):
+    """Groups should be numbered in the order they are first seen
+    """
+    table = titanic.groupby(['sex', 'class', 'who']).agg({'fare': 'sum'})
+    table = table.iloc[::-1]
+    groups, labels = table.stb._get_group_levels(2)
+    expected = list(dict.fromkeys(idx[:2] for idx in table.index))
+    assert list(labels) == expected
+    assert [labels[g] for g in groups] == [idx[:2] for idx in table.index]
+
+
+def test_freq_approx(titanic):
+    """Approximate frequency tables should bound the exact counts
+    """
+    exact = titanic.stb.freq(['sex', 'class'])
+    table = titanic.stb.freq(['sex', 'class'], approx=True)
+    pd.testing.assert_frame_equal(table.drop(columns=['count_error']), exact)
+    assert table['count_error'].sum() == 0
+
+    table = titanic.stb.freq(['sex', 'class'], approx=True, approx_capacity=3)
+    assert table.shape == (4, 7)
+    assert table.iloc[-1, 0] == 'others'
+    assert table['count'].sum() == 891
+    assert table['cumulative_percent'].iloc[-1] == 100
+
+    table = titanic.stb.freq(['class'], value='fare', thresh=80, approx=True)
+    assert table.iloc[-1, 0] == 'others'
+    assert table['fare'].sum() == pytest.approx(titanic['fare'].sum())
+
+
+def test_freq_thresh_many_groups():
+    """The top groups fast path should match sorting every group
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'key': rng.zipf(1.5, 100_000) % 20_000,
+        'label': pd.Categorical(rng.choice(['a', 'b'], 100_000))
+    })
+    expected = df.stb.freq(['key', 'label'], sort_cols=True)
+    expected = expected.sort_values(['count', 'key', 'label'],
+                                    ascending=False).reset_index(drop=True)
+    kept = expected[expected['cumulative_percent'] <= 60]
+
+    table = df.stb.freq(['key', 'label'], thresh=60)
+    assert len(table) == len(kept) + 1
+    assert list(table['key'].iloc[:-1]) == list(kept['key'])
+    assert table.iloc[-1, 0] == 'others'
+    assert table['count'].sum() == len(df)
+
+
+def test_freq_categorical(titanic):
+    """Categorical columns should keep their dtype and match groupby
+    """
+    df = titanic.assign(deck=titanic['deck'].astype('category'))
+    table = df.stb.freq(['deck', 'pclass'])
+    expected = df.groupby(['deck', 'pclass'], observed=False).size()
+    expected = expected[expected > 0]
+    assert table['count'].sum() == expected.sum()
+    assert len(table) == len(expected)
+    assert isinstance(table['deck'].dtype, pd.CategoricalDtype)
+
+    table = df.stb.freq(['deck'], thresh=60)
+    assert isinstance(table['deck'].dtype, pd.CategoricalDtype)
+    assert table.iloc[-1, 0] == 'others'
+    assert table['count'].sum() == df['deck'].notna().sum()
+
+
+def test_freq_narrow_int():
+    """Narrow integer columns with a wide range should keep every group
+    """
+    for values, dtype in [([-100, 100, 100, 5], 'int8'), ([-30000, 30000, 1], 'int16'),
+                          ([0, 255, 255], 'uint8'), ([2**63 + 5, 2**63 + 5, 2**63 + 7], 'uint64')]:
+        df = pd.DataFrame({'num': np.array(values, dtype=dtype)})
+        table = df.stb.freq(['num'])
+        expected = df['num'].value_counts()
+        assert table['count'].sum() == len(df)
+        assert dict(zip(table['num'], table['count'])) == expected.to_dict()
+        assert table['num'].dtype == dtype
+
+
+def test_cache(titanic):
+    """Repeated calls should come from the cache until the data changes
+    """
+    sidetable_pkg.enable_cache(maxsize=2)
+    try:
+        df = titanic.copy()
+        first = df.stb.freq(['class'])
+        first.iloc[0, 1] = -1
+        pd.testing.assert_frame_equal(df.stb.freq(['class']), titanic.stb.freq(['class']))
+        assert sidetable_pkg.cache_info().hits == 1
+
+        df['extra'] = 1
+        df.stb.freq(['class'])
+        df.stb.missing()
+        info = sidetable_pkg.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 4, 2)
+
+        df.stb.cache_clear()
+        assert sidetable_pkg.cache_info().currsize == 0
+    finally:
+        sidetable_pkg.disable_cache()
+    assert sidetable_pkg.cache_info() is None
+
+
+def test_lazy(titanic):
+    """A plan should return the same tables as calling each summary
+    """
+    freq_class, freq_both, missing, counts = (titanic.stb.lazy()
+                                              .freq(['class'])
+                                              .freq(['sex', 'class'], thresh=80)
+                                              .missing()
+                                              .counts()
+                                              .collect())
+    pd.testing.assert_frame_equal(freq_class, titanic.stb.freq(['class']))
+    pd.testing.assert_frame_equal(freq_both, titanic.stb.freq(['sex', 'class'], thresh=80))
+    pd.testing.assert_frame_equal(missing, titanic.stb.missing())
+    pd.testing.assert_frame_equal(counts, titanic.stb.counts())
+
+    with pytest.raises(AttributeError):
+        titanic.stb.lazy().freq('class')
+
+
+def test_lazy_categorical_missing(titanic):
+    """A plan that groups a categorical with a column that has missing values should match
+    """
+    df = titanic.assign(deck=titanic['deck'].astype('category'),
+                        embark_town=titanic['embark_town'].astype(object))
+    df.loc[df.index[:5], 'embark_town'] = None
+    table, = df.stb.lazy().freq(['embark_town', 'deck']).collect()
+    pd.testing.assert_frame_equal(table, df.stb.freq(['embark_town', 'deck']))
+
+
+def test_polars(titanic):
+    """The polars namespace should return the same tables as pandas
+    """
+    pl = pytest.importorskip('polars')
+    pytest.importorskip('pyarrow')
+    import sidetable.polars_backend  # noqa: F401
+
+    # Polars categoricals do not keep the pandas category order
+    df = titanic.astype({'deck': object, 'class': object})
+    polars_df = pl.from_pandas(df)
+    pd.testing.assert_frame_equal(polars_df.stb.freq(['sex', 'class'], thresh=80),
+                                  df.stb.freq(['sex', 'class'], thresh=80))
+    pd.testing.assert_frame_equal(polars_df.stb.freq(['deck'], value='fare'),
+                                  df.stb.freq(['deck'], value='fare'))
+    pd.testing.assert_frame_equal(polars_df.stb.missing(), df.stb.missing())
+    pd.testing.assert_frame_equal(polars_df.stb.counts(exclude='number'),
+                                  df.stb.counts(exclude='number'))
+
+
+def test_scan_parquet(titanic, tmp_path, monkeypatch):
+    """Parquet scans should match the in memory tables
+    """
+    pq = pytest.importorskip('pyarrow.parquet')
+    titanic.iloc[:400].to_parquet(tmp_path / 'first.parquet', row_group_size=100)
+    titanic.iloc[400:].to_parquet(tmp_path / 'second.parquet', row_group_size=150)
+    scan = sidetable_pkg.scan_parquet(tmp_path)
+    pd.testing.assert_frame_equal(scan.freq(['sex', 'class'], thresh=80),
+                                  titanic.stb.freq(['sex', 'class'], thresh=80))
+    pd.testing.assert_frame_equal(scan.counts(), titanic.stb.counts())
+
+    # Missing values only need the footer statistics
+    def no_reads(*args, **kwargs):
+        raise AssertionError('Data pages should not be read')
+    monkeypatch.setattr(pq.ParquetFile, 'read_row_group', no_reads)
+    pd.testing.assert_frame_equal(scan.missing(), titanic.stb.missing())
+
+
+def test_missing_memory():
+    """Counting missing values should not build a mask for a whole column
+    """
+    data = np.random.default_rng(0).random((1_000_000, 4))
+    data[data < 0.1] = np.nan
+    df = pd.DataFrame(data)
+    tracemalloc.start()
+    try:
+        table = df.stb.missing()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert list(table['missing']) == list(np.isnan(data).sum(axis=0)[table.index])
+    assert peak < len(df)
+
+
+def test_sample(titanic):
+    """Sampled tables should be scaled to the full data and bound the exact values
+    """
+    exact = titanic.stb.missing()
+    table = titanic.stb.missing(sample=0.5, random_state=1)
+    assert list(table.columns) == ['missing', 'total', 'percent', 'percent_low', 'percent_high']
+    assert (table['total'] == len(titanic)).all()
+    assert (table['percent_low'] <= table['percent']).all()
+    assert (table['percent'] <= table['percent_high']).all()
+    pd.testing.assert_frame_equal(titanic.stb.missing(sample=len(titanic))[exact.columns],
+                                  exact)
+
+    table = titanic.stb.counts(sample=400, random_state=1)
+    assert table.loc['sex', 'count'] == len(titanic)
+    assert table.loc['sex', 'unique'] == 2
+    assert (table['unique_low'] <= table['unique']).all()
+    assert (table['unique'] <= table['unique_high']).all()
+
+    with pytest.raises(AttributeError):
+        titanic.stb.counts(sample=-1)
+    with pytest.raises(AttributeError):
+        titanic.stb.counts(sample=1.5)
+    # A fraction of 1.0 is every row and an int of 1 is a single row
+    table = titanic.stb.counts(sample=1.0)
+    pd.testing.assert_series_equal(table['unique'], titanic.stb.counts()['unique'].loc[table.index])
+    assert len(titanic.stb.missing(sample=1, random_state=1)) == titanic.shape[1]
+
+
+def test_counts_approx_unique(titanic):
+    """HyperLogLog estimates should be close to the exact unique values and mergeable
+    """
+    exact = titanic.stb.counts()
+    table = titanic.stb.counts(approx_unique=True)
+    assert list(table.columns) == list(exact.columns)
+    pd.testing.assert_series_equal(table['count'], exact['count'])
+    assert table['unique'].astype(float).values == pytest.approx(
+        exact.loc[table.index, 'unique'].astype(float).values, rel=0.05)
+    assert table.loc['sex', 'most_freq'] == exact.loc['sex', 'most_freq']
+
+    values = pd.Series(np.arange(50_000))
+    first = sidetable_pkg.HyperLogLog(12).update(values[:30_000])
+    second = pickle.loads(pickle.dumps(sidetable_pkg.HyperLogLog(12).update(values[20_000:])))
+    assert first.merge(second).estimate() == pytest.approx(50_000, rel=0.05)
+    with pytest.raises(AttributeError):
+        first.merge(sidetable_pkg.HyperLogLog(10))